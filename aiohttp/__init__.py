@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
+
 
 class ClientError(Exception):
     """Base exception for aiohttp client errors."""
@@ -11,3 +13,13 @@ class ClientSession:
     """Placeholder client session."""
 
     pass
+
+
+@dataclass(frozen=True)
+class ClientTimeout:
+    """Timeout configuration for client requests."""
+
+    total: float | None = None
+    connect: float | None = None
+    sock_read: float | None = None
+    sock_connect: float | None = None
@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
+import inspect
 import logging
 from dataclasses import dataclass, field
-from typing import Any, Mapping
+from types import MappingProxyType
+from typing import Any, Callable, Mapping
 
+import voluptuous as vol
 from aiohttp import ClientSession
 from homeassistant.components import conversation as ha_conversation
 from homeassistant.config_entries import ConfigEntry
@@ -17,29 +20,31 @@ from homeassistant.helpers.typing import ConfigType
 
 from .api_client import AIEmbodiedClient, AIEmbodiedClientConfig, AIEmbodiedClientError
 from .autonomy import AutonomyController
-from .config_flow import AIEmbodiedOptionsFlowHandler
 from .const import (
     CONF_AUTH_TOKEN,
+    CONF_BATCH_ENVELOPE,
     CONF_BATCHING,
     CONF_ENDPOINT,
     CONF_EXPOSURE,
+    CONF_FINE_GRAINED_AUDIT,
     CONF_HEADERS,
     CONF_ROUTING,
     CONF_THROTTLE,
-    DATA_RUNTIME,
     DOMAIN,
+    EVENT_ACTION_EXECUTED,
     OPTIONS_AUTONOMY_PAUSED,
     OPTIONS_BURST_SIZE,
     OPTIONS_DEBUG,
     OPTIONS_MAX_EVENTS_PER_MINUTE,
-    RUNTIME_DATA_AUTONOMY,
-    RUNTIME_DATA_OPTIONS,
 )
 from .conversation import AIEmbodiedConversationAgent
 from .exposure import ExposureController
 
 TYPE_CHECKING = False
 
+if TYPE_CHECKING:  # pragma: no cover - imports for type checking only
+    from .config_flow import AIEmbodiedOptionsFlowHandler
+
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -50,17 +55,19 @@ PLATFORMS: list[Platform] = [
 ]
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, frozen=True)
 class IntegrationConfig:
     """Runtime configuration derived from a config entry."""
 
     endpoint: str
     auth_token: str | None
-    headers: dict[str, str]
-    exposure: list[str] = field(default_factory=list)
+    headers: Mapping[str, str]
+    exposure: tuple[str, ...] = ()
     throttle: int | None = None
     batching: bool = False
-    routing: dict[str, str] = field(default_factory=dict)
+    batch_envelope: bool = False
+    fine_grained_audit: bool = True
+    routing: Mapping[str, str] = field(default_factory=dict)
 
 
 @dataclass(slots=True)
@@ -73,7 +80,7 @@ class IntegrationOptions:
     autonomy_paused: bool = False
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, frozen=True)
 class RuntimeData:
     """Container for per-config entry runtime resources."""
 
@@ -93,8 +100,17 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     return True
 
 
-async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    """Set up aiembodied from a config entry."""
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    *,
+    client_factory: Callable[[ClientSession, IntegrationConfig], AIEmbodiedClient] | None = None,
+) -> bool:
+    """Set up aiembodied from a config entry.
+
+    ``client_factory`` replaces the default API client construction, letting tests
+    inject a client without patching the module.
+    """
 
     hass.data.setdefault(DOMAIN, {})
 
@@ -102,7 +118,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     _apply_debug_logging(options)
 
     runtime_config = _create_integration_config(entry.data)
-    client = _create_client(hass, runtime_config)
+    session = _async_get_clientsession(hass)
+    client = (client_factory or _create_client)(session, runtime_config)
     agent = AIEmbodiedConversationAgent(client, runtime_config)
     autonomy = AutonomyController(
         hass,
@@ -117,6 +134,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         autonomy,
     )
     autonomy.add_pause_callbacks([exposure.async_set_paused])
+    # Start listeners before the entry becomes visible, so a failure here leaves
+    # nothing registered that would need to be rolled back.
     await exposure.async_setup()
     await autonomy.async_set_paused(options.autonomy_paused, persist=False, force_notify=True)
     runtime = RuntimeData(
@@ -127,11 +146,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         options=options,
         autonomy=autonomy,
     )
-    hass.data[DOMAIN][entry.entry_id] = {
-        DATA_RUNTIME: runtime,
-        RUNTIME_DATA_OPTIONS: options,
-        RUNTIME_DATA_AUTONOMY: autonomy,
-    }
+    hass.data[DOMAIN][entry.entry_id] = runtime
 
     ha_conversation.async_set_agent(hass, entry, agent)
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
@@ -145,12 +160,11 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     ha_conversation.async_unset_agent(hass, entry)
     await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
-    runtime_wrapper = hass.data.get(DOMAIN, {}).pop(entry.entry_id, None)
-    runtime: RuntimeData | None = None
-    if runtime_wrapper is not None:
-        runtime = runtime_wrapper.get(DATA_RUNTIME)
-
-    if runtime and runtime.exposure:
+    runtime: RuntimeData | None = hass.data[DOMAIN].pop(entry.entry_id, None)
+    if runtime is None:
+        return True
+    await runtime.autonomy.async_shutdown()
+    if runtime.exposure:
         await runtime.exposure.async_shutdown()
     return True
 
@@ -161,29 +175,31 @@ async def _async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     await hass.config_entries.async_reload(entry.entry_id)
 
 
-def _create_client(hass: HomeAssistant, config: IntegrationConfig) -> AIEmbodiedClient:
-    """Instantiate the API client for the integration."""
+def _create_client(session: ClientSession, config: IntegrationConfig) -> AIEmbodiedClient:
+    """Instantiate the API client on the shared Home Assistant session."""
 
-    session = _async_get_clientsession(hass)
     client_config = AIEmbodiedClientConfig(
         endpoint=config.endpoint,
         auth_token=config.auth_token,
         headers=config.headers,
+        throttle=config.throttle,
     )
     return AIEmbodiedClient(session, client_config)
 
 
-def _create_integration_config(entry_data: dict[str, Any]) -> IntegrationConfig:
+def _create_integration_config(entry_data: Mapping[str, Any]) -> IntegrationConfig:
     """Build the runtime configuration from entry data."""
 
     return IntegrationConfig(
         endpoint=entry_data[CONF_ENDPOINT],
         auth_token=entry_data.get(CONF_AUTH_TOKEN),
-        headers=dict(entry_data.get(CONF_HEADERS, {})),
-        exposure=list(entry_data.get(CONF_EXPOSURE, [])),
+        headers=MappingProxyType(entry_data.get(CONF_HEADERS, {})),
+        exposure=tuple(entry_data.get(CONF_EXPOSURE, ())),
         throttle=entry_data.get(CONF_THROTTLE),
         batching=bool(entry_data.get(CONF_BATCHING, False)),
-        routing=dict(entry_data.get(CONF_ROUTING, {})),
+        batch_envelope=bool(entry_data.get(CONF_BATCH_ENVELOPE, False)),
+        fine_grained_audit=bool(entry_data.get(CONF_FINE_GRAINED_AUDIT, True)),
+        routing=MappingProxyType(entry_data.get(CONF_ROUTING, {})),
     )
 
 
@@ -215,9 +231,21 @@ async def async_get_options_flow(
 ) -> AIEmbodiedOptionsFlowHandler:
     """Return the options flow handler."""
 
+    from .config_flow import AIEmbodiedOptionsFlowHandler
+
     return AIEmbodiedOptionsFlowHandler(config_entry)
 
 
+def __getattr__(name: str) -> Any:
+    """Resolve the options flow handler lazily; the flow UI is rarely opened."""
+
+    if name == "AIEmbodiedOptionsFlowHandler":
+        from .config_flow import AIEmbodiedOptionsFlowHandler
+
+        return AIEmbodiedOptionsFlowHandler
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def _async_get_clientsession(hass: HomeAssistant) -> ClientSession:
     """Retrieve the shared aiohttp client session."""
 
@@ -251,6 +279,38 @@ ATTR_SERVICE_DATA = "service_data"
 ATTR_TARGET = "target"
 ATTR_CORRELATION_ID = "correlation_id"
 
+_OPTIONAL_CONTEXT_ATTRS = (ATTR_CONTEXT_ID, ATTR_CONTEXT_USER_ID, ATTR_CONTEXT_PARENT_ID)
+# Resolved once so building a context never needs a TypeError fallback.
+_CONTEXT_SUPPORTS_PARENT = "parent_id" in inspect.signature(Context).parameters
+
+SERVICE_SEND_CONVERSATION_TURN_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENTRY_ID): vol.All(str, vol.Length(min=1)),
+        vol.Required(ATTR_TEXT): vol.All(str, vol.Length(min=1)),
+        # Automations commonly pass explicit nulls for unused optional fields.
+        vol.Optional(ATTR_CONVERSATION_ID): vol.Any(None, str),
+        vol.Optional(ATTR_LANGUAGE): vol.Any(None, str),
+        vol.Optional(ATTR_DEVICE_ID): vol.Any(None, str),
+        vol.Optional(ATTR_CONTEXT_ID): vol.Any(None, str),
+        vol.Optional(ATTR_CONTEXT_USER_ID): vol.Any(None, str),
+        vol.Optional(ATTR_CONTEXT_PARENT_ID): vol.Any(None, str),
+    }
+)
+
+SERVICE_INVOKE_SERVICE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENTRY_ID): vol.All(str, vol.Length(min=1)),
+        vol.Required(ATTR_DOMAIN): vol.All(str, vol.Length(min=1)),
+        vol.Required(ATTR_SERVICE): vol.All(str, vol.Length(min=1)),
+        vol.Optional(ATTR_SERVICE_DATA): vol.Any(None, dict),
+        vol.Optional(ATTR_TARGET): vol.Any(None, dict),
+        vol.Optional(ATTR_CORRELATION_ID): vol.Any(None, str),
+        vol.Optional(ATTR_CONTEXT_ID): vol.Any(None, str),
+        vol.Optional(ATTR_CONTEXT_USER_ID): vol.Any(None, str),
+        vol.Optional(ATTR_CONTEXT_PARENT_ID): vol.Any(None, str),
+    }
+)
+
 
 def _async_register_services(hass: HomeAssistant) -> None:
     """Register integration services once per Home Assistant instance."""
@@ -259,52 +319,42 @@ def _async_register_services(hass: HomeAssistant) -> None:
         return
 
     async def _async_handle_send_conversation_turn(call: Any) -> Mapping[str, Any]:
-        data = _validate_service_data(getattr(call, "data", {}))
+        data: Mapping[str, Any] = call.data
         entry_id = data[ATTR_ENTRY_ID]
-        runtime_wrapper = hass.data.get(DOMAIN, {}).get(entry_id)
-        if not runtime_wrapper:
-            raise HomeAssistantError(
-                f"No aiembodied configuration found for entry_id '{entry_id}'"
-            )
-
-        runtime: RuntimeData | None = runtime_wrapper.get(DATA_RUNTIME)
+        runtime: RuntimeData | None = hass.data[DOMAIN].get(entry_id)
         if runtime is None:
-            raise HomeAssistantError(
-                f"Integration for entry_id '{entry_id}' is not currently active"
-            )
+            raise HomeAssistantError(f"No aiembodied configuration found for entry_id '{entry_id}'")
 
         conversation_input = _conversation_input_from_service_data(data)
         result = await runtime.agent.async_handle(conversation_input)
 
-        response: dict[str, Any] = {"conversation_id": result.conversation_id}
-        if result.response is not None:
-            response["response"] = {
-                "text": result.response.text,
-                "language": result.response.language,
-                "data": result.response.data,
-            }
-        return response
+        agent_response = result.response
+        if agent_response is None:
+            return {"conversation_id": result.conversation_id}
+        return {
+            "conversation_id": result.conversation_id,
+            "response": {
+                "text": agent_response.text,
+                "language": agent_response.language,
+                "data": agent_response.data,
+            },
+        }
 
     hass.services.async_register(
         DOMAIN,
         SERVICE_SEND_CONVERSATION_TURN,
         _async_handle_send_conversation_turn,
+        schema=SERVICE_SEND_CONVERSATION_TURN_SCHEMA,
         supports_response=True,
     )
 
     async def _async_handle_invoke_service(call: Any) -> Mapping[str, Any]:
-        data = _validate_action_service_data(getattr(call, "data", {}))
+        data = _validate_action_service_data(call.data)
         entry_id = data[ATTR_ENTRY_ID]
-        runtime_wrapper = hass.data.get(DOMAIN, {}).get(entry_id)
-        if not runtime_wrapper:
-            raise HomeAssistantError(
-                f"No aiembodied configuration found for entry_id '{entry_id}'"
-            )
-
-        runtime: RuntimeData | None = runtime_wrapper.get(DATA_RUNTIME)
+        runtime: RuntimeData | None = hass.data[DOMAIN].get(entry_id)
         if runtime is None:
             raise HomeAssistantError(
-                f"Integration for entry_id '{entry_id}' is not currently active"
+                f"No aiembodied configuration found for entry_id '{entry_id}'"
             )
 
         if runtime.autonomy.paused:
@@ -315,7 +365,7 @@ def _async_register_services(hass: HomeAssistant) -> None:
         context = _context_from_service_data(data)
         domain = data[ATTR_DOMAIN]
         service = data[ATTR_SERVICE]
-        service_data = dict(data.get(ATTR_SERVICE_DATA, {}))
+        service_data = data[ATTR_SERVICE_DATA]
         target = data.get(ATTR_TARGET)
         correlation_id = data.get(ATTR_CORRELATION_ID)
 
@@ -329,11 +379,7 @@ def _async_register_services(hass: HomeAssistant) -> None:
                 target=target,
                 context=context,
             )
-        except HomeAssistantError as exc:
-            success = False
-            error_message = str(exc)
-            result = None
-        except Exception as exc:  # pragma: no cover - defensive safety net
+        except Exception as exc:  # reported upstream and to the caller, not raised
             success = False
             error_message = str(exc)
             result = None
@@ -353,30 +399,20 @@ def _async_register_services(hass: HomeAssistant) -> None:
         if error_message is not None:
             audit["error"] = error_message
 
-        hass.bus.async_fire(f"{DOMAIN}.action_executed", audit)
-
-        payload: dict[str, Any] = {
-            "type": "action_result",
-            "action": {
-                "entry_id": entry_id,
-                "domain": domain,
-                "service": service,
-                "service_data": service_data,
-                "success": success,
-                "result": result,
-            },
-        }
-        if target is not None:
-            payload["action"]["target"] = target
-        if correlation_id is not None:
-            payload["action"]["correlation_id"] = correlation_id
-
-        context_dict = _serialize_context_for_action(context)
-        if context_dict is not None:
-            payload["action"]["context"] = context_dict
-
-        if not success and error_message is not None:
-            payload["action"]["error"] = error_message
+        hass.bus.async_fire(EVENT_ACTION_EXECUTED, audit)
+
+        payload = _build_action_payload(
+            entry_id=entry_id,
+            domain=domain,
+            service=service,
+            service_data=service_data,
+            success=success,
+            result=result,
+            target=target,
+            correlation_id=correlation_id,
+            context=context,
+            error_message=error_message,
+        )
 
         try:
             await runtime.client.async_post_json(payload)
@@ -402,6 +438,7 @@ def _async_register_services(hass: HomeAssistant) -> None:
         DOMAIN,
         SERVICE_INVOKE_SERVICE,
         _async_handle_invoke_service,
+        schema=SERVICE_INVOKE_SERVICE_SCHEMA,
         supports_response=True,
     )
 
@@ -414,9 +451,9 @@ def _conversation_input_from_service_data(
     context = _context_from_service_data(data)
     return ha_conversation.ConversationInput(
         text=data[ATTR_TEXT],
-        conversation_id=data.get(ATTR_CONVERSATION_ID),
-        language=data.get(ATTR_LANGUAGE),
-        device_id=data.get(ATTR_DEVICE_ID),
+        conversation_id=data.get(ATTR_CONVERSATION_ID) or None,
+        language=data.get(ATTR_LANGUAGE) or None,
+        device_id=data.get(ATTR_DEVICE_ID) or None,
         context=context,
     )
 
@@ -424,29 +461,53 @@ def _conversation_input_from_service_data(
 def _context_from_service_data(data: Mapping[str, Any]) -> Context | None:
     """Create a Home Assistant context from service attributes."""
 
+    context_id = data.get(ATTR_CONTEXT_ID)
+    user_id = data.get(ATTR_CONTEXT_USER_ID)
+    parent_id = data.get(ATTR_CONTEXT_PARENT_ID)
+    if not (context_id or user_id or parent_id):
+        return None
+
     context_kwargs: dict[str, str] = {}
-    if context_id := data.get(ATTR_CONTEXT_ID):
+    if context_id:
         context_kwargs["id"] = context_id
-    if user_id := data.get(ATTR_CONTEXT_USER_ID):
+    if user_id:
         context_kwargs["user_id"] = user_id
-    parent_id = data.get(ATTR_CONTEXT_PARENT_ID)
-    if parent_id:
+    if parent_id and _CONTEXT_SUPPORTS_PARENT:
         context_kwargs["parent_id"] = parent_id
-    if not context_kwargs:
-        return None
-
-    try:
-        return Context(**context_kwargs)
-    except TypeError:
-        # Fallback for stubbed Context implementations without parent_id support
-        context_kwargs.pop("parent_id", None)
-        context = Context(**context_kwargs)
-        if parent_id:
-            try:
-                setattr(context, "parent_id", parent_id)
-            except AttributeError:  # pragma: no cover - slots without parent_id attribute
-                pass
-        return context
+    return Context(**context_kwargs)
+
+
+def _build_action_payload(
+    *,
+    entry_id: str,
+    domain: str,
+    service: str,
+    service_data: Mapping[str, Any],
+    success: bool,
+    result: Any,
+    target: Mapping[str, Any] | None,
+    correlation_id: str | None,
+    context: Context | None,
+    error_message: str | None,
+) -> dict[str, Any]:
+    """Assemble the action_result payload reported upstream."""
+
+    action: dict[str, Any] = {
+        "entry_id": entry_id,
+        "domain": domain,
+        "service": service,
+        "service_data": service_data,
+        "success": success,
+        "result": result,
+    }
+    optional = (
+        ("target", target),
+        ("correlation_id", correlation_id),
+        ("context", _serialize_context_for_action(context)),
+        ("error", error_message),
+    )
+    action.update((key, value) for key, value in optional if value is not None)
+    return {"type": "action_result", "action": action}
 
 
 def _serialize_context_for_action(context: Context | None) -> dict[str, str] | None:
@@ -454,100 +515,35 @@ def _serialize_context_for_action(context: Context | None) -> dict[str, str] | N
 
     if context is None:
         return None
+    context_id = getattr(context, "id", None)
+    user_id = getattr(context, "user_id", None)
+    parent_id = getattr(context, "parent_id", None)
+    if not (context_id or user_id or parent_id):
+        return None
+
     result: dict[str, str] = {}
-    for attr in ("id", "user_id", "parent_id"):
-        value = getattr(context, attr, None)
-        if isinstance(value, str) and value:
-            result[attr] = value
+    if isinstance(context_id, str) and context_id:
+        result["id"] = context_id
+    if isinstance(user_id, str) and user_id:
+        result["user_id"] = user_id
+    if isinstance(parent_id, str) and parent_id:
+        result["parent_id"] = parent_id
     return result or None
 
 
-def _validate_service_data(data: Mapping[str, Any]) -> dict[str, Any]:
-    """Validate the payload received via the helper service."""
-
-    normalized: dict[str, Any] = {}
-
-    entry_id = data.get(ATTR_ENTRY_ID)
-    if not isinstance(entry_id, str) or not entry_id:
-        raise HomeAssistantError("Service data must include a non-empty entry_id")
-    normalized[ATTR_ENTRY_ID] = entry_id
-
-    text = data.get(ATTR_TEXT)
-    if not isinstance(text, str) or not text:
-        raise HomeAssistantError("Service data must include a non-empty text value")
-    normalized[ATTR_TEXT] = text
-
-    for attr in (
-        ATTR_CONVERSATION_ID,
-        ATTR_LANGUAGE,
-        ATTR_DEVICE_ID,
-        ATTR_CONTEXT_ID,
-        ATTR_CONTEXT_USER_ID,
-        ATTR_CONTEXT_PARENT_ID,
-    ):
-        value = data.get(attr)
-        if value is None:
-            continue
-        if not isinstance(value, str):
-            raise HomeAssistantError(f"Attribute '{attr}' must be a string if provided")
-        if value:
-            normalized[attr] = value
-
-    return normalized
-
-
 def _validate_action_service_data(data: Mapping[str, Any]) -> dict[str, Any]:
-    """Validate the payload for outbound service execution."""
-
-    normalized: dict[str, Any] = {}
-
-    entry_id = data.get(ATTR_ENTRY_ID)
-    if not isinstance(entry_id, str) or not entry_id:
-        raise HomeAssistantError("Service data must include a non-empty entry_id")
-    normalized[ATTR_ENTRY_ID] = entry_id
-
-    domain = data.get(ATTR_DOMAIN)
-    if not isinstance(domain, str) or not domain:
-        raise HomeAssistantError("Service data must include a non-empty domain")
-    normalized[ATTR_DOMAIN] = domain
+    """Validate the payload for outbound service execution and fill its defaults."""
 
-    service = data.get(ATTR_SERVICE)
-    if not isinstance(service, str) or not service:
-        raise HomeAssistantError("Service data must include a non-empty service")
-    normalized[ATTR_SERVICE] = service
+    try:
+        normalized = SERVICE_INVOKE_SERVICE_SCHEMA(dict(data))
+    except vol.Invalid as exc:
+        raise HomeAssistantError(f"Invalid service data: {exc}") from exc
 
-    service_data = data.get(ATTR_SERVICE_DATA)
-    if service_data is None:
+    if normalized.get(ATTR_SERVICE_DATA) is None:
         normalized[ATTR_SERVICE_DATA] = {}
-    elif isinstance(service_data, Mapping):
-        normalized[ATTR_SERVICE_DATA] = dict(service_data)
-    else:
-        raise HomeAssistantError("Attribute 'service_data' must be a mapping if provided")
-
-    target = data.get(ATTR_TARGET)
-    if target is not None:
-        if not isinstance(target, Mapping):
-            raise HomeAssistantError("Attribute 'target' must be a mapping if provided")
-        normalized[ATTR_TARGET] = dict(target)
-
-    correlation_id = data.get(ATTR_CORRELATION_ID)
-    if correlation_id is not None:
-        if not isinstance(correlation_id, str):
-            raise HomeAssistantError("Attribute 'correlation_id' must be a string if provided")
-        if correlation_id:
-            normalized[ATTR_CORRELATION_ID] = correlation_id
-
-    for attr in (
-        ATTR_CONTEXT_ID,
-        ATTR_CONTEXT_USER_ID,
-        ATTR_CONTEXT_PARENT_ID,
-    ):
-        value = data.get(attr)
-        if value is None:
-            continue
-        if not isinstance(value, str):
-            raise HomeAssistantError(f"Attribute '{attr}' must be a string if provided")
-        if value:
-            normalized[attr] = value
-
+    if normalized.get(ATTR_TARGET) is None:
+        normalized.pop(ATTR_TARGET, None)
+    for attr in (ATTR_CORRELATION_ID, *_OPTIONAL_CONTEXT_ATTRS):
+        if not normalized.get(attr):
+            normalized.pop(attr, None)
     return normalized
@@ -2,13 +2,20 @@
 
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
+from types import MappingProxyType
 from typing import Any, Mapping
 
-from aiohttp import ClientError, ClientSession
+import orjson
+
+from aiohttp import ClientError, ClientSession, ClientTimeout
 
 from .const import DEFAULT_TIMEOUT
 
+# Longest a throttled request may queue for a token before it is rejected.
+_THROTTLE_MAX_WAIT = 60.0
+
 
 @dataclass(slots=True)
 class AIEmbodiedClientConfig:
@@ -18,6 +25,36 @@ class AIEmbodiedClientConfig:
     auth_token: str | None = None
     headers: Mapping[str, str] | None = None
     timeout: float = DEFAULT_TIMEOUT
+    throttle: int | None = None
+
+
+class _TokenBucket:
+    """Token bucket limiting outbound requests to a per-minute rate."""
+
+    def __init__(self, rate_per_minute: int) -> None:
+        self._rate = rate_per_minute / 60
+        self._capacity = float(rate_per_minute)
+        self._tokens = self._capacity
+        self._updated: float | None = None
+
+    async def async_acquire(self) -> None:
+        """Reserve a token and wait for it, failing fast if the backlog is too long.
+
+        Reservations may drive the balance negative, which queues later callers behind
+        earlier ones without holding a lock across the sleep.
+        """
+
+        now = asyncio.get_running_loop().time()
+        if self._updated is not None:
+            elapsed = now - self._updated
+            self._tokens = min(self._capacity, self._tokens + elapsed * self._rate)
+        self._updated = now
+        wait = (1 - self._tokens) / self._rate if self._tokens < 1 else 0.0
+        if wait > _THROTTLE_MAX_WAIT:
+            raise AIEmbodiedThrottledError("Request throttled: upstream rate limit backlog is full")
+        self._tokens -= 1
+        if wait:
+            await asyncio.sleep(wait)
 
 
 class AIEmbodiedClient:
@@ -26,6 +63,9 @@ class AIEmbodiedClient:
     def __init__(self, session: ClientSession, config: AIEmbodiedClientConfig) -> None:
         self._session = session
         self._config = config
+        self._bucket = _TokenBucket(config.throttle) if config.throttle else None
+        self._headers = _build_headers(config)
+        self._timeout = ClientTimeout(total=config.timeout)
 
     @property
     def config(self) -> AIEmbodiedClientConfig:
@@ -33,35 +73,62 @@ class AIEmbodiedClient:
 
         return self._config
 
-    async def async_post_json(self, payload: Mapping[str, Any]) -> dict[str, Any]:
+    async def async_post_json(
+        self, payload: Mapping[str, Any], *, throttled: bool = False
+    ) -> dict[str, Any]:
         """Send a JSON payload to the AI endpoint and return the decoded response.
 
+        ``throttled`` requests wait on the configured per-minute rate limit. It is meant
+        for background traffic such as forwarded state changes, so user-facing
+        conversation turns never queue behind an event burst.
+
         This method does not yet implement retries or advanced error handling. Future
         implementation steps will extend it with additional safeguards as described in
         the PRD.
         """
 
-        headers: dict[str, str] = {"Content-Type": "application/json"}
-        if self._config.headers:
-            headers.update(self._config.headers)
-        if self._config.auth_token:
-            headers.setdefault("Authorization", self._config.auth_token)
+        if throttled and self._bucket is not None:
+            await self._bucket.async_acquire()
 
+        body = orjson.dumps(payload, default=_json_default, option=orjson.OPT_NON_STR_KEYS)
         try:
             async with self._session.post(
                 self._config.endpoint,
-                json=payload,
-                headers=headers,
-                timeout=self._config.timeout,
+                data=body,
+                headers=self._headers,
+                timeout=self._timeout,
             ) as response:
                 response.raise_for_status()
-                return await response.json()
-        except ClientError as exc:
+                return orjson.loads(await response.read())
+        except (ClientError, orjson.JSONDecodeError) as exc:
             raise AIEmbodiedClientError("Error communicating with AI endpoint") from exc
 
 
+def _json_default(value: Any) -> Any:
+    """Serialize read-only mappings that orjson does not handle natively."""
+
+    if isinstance(value, Mapping):
+        return dict(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def _build_headers(config: AIEmbodiedClientConfig) -> Mapping[str, str]:
+    """Merge the static request headers once per client."""
+
+    headers: dict[str, str] = {"Content-Type": "application/json"}
+    if config.headers:
+        headers.update(config.headers)
+    if config.auth_token:
+        headers.setdefault("Authorization", config.auth_token)
+    return MappingProxyType(headers)
+
+
 class AIEmbodiedClientError(RuntimeError):
     """Raised when the AI Embodied client encounters an error."""
 
     def __init__(self, message: str) -> None:
         super().__init__(message)
+
+
+class AIEmbodiedThrottledError(AIEmbodiedClientError):
+    """Raised when the local rate limit rejects a request before it is sent."""
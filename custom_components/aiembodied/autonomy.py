@@ -12,6 +12,7 @@ from homeassistant.core import HomeAssistant, callback
 
 from .const import (
     AUTONOMY_FAILURE_THRESHOLD,
+    AUTONOMY_PERSIST_DELAY,
     NOTIFICATION_AUTONOMY_FAILURE,
     OPTIONS_AUTONOMY_PAUSED,
 )
@@ -19,7 +20,7 @@ from .const import (
 _LOGGER = logging.getLogger(__name__)
 
 
-@dataclass(slots=True)
+@dataclass(frozen=True, slots=True)
 class AutonomyDiagnostics:
     """Diagnostic information surfaced through entities."""
 
@@ -31,6 +32,22 @@ class AutonomyDiagnostics:
 class AutonomyController:
     """Track autonomy state, diagnostics, and persistence."""
 
+    __slots__ = (
+        "_hass",
+        "_entry",
+        "_paused",
+        "_failure_threshold",
+        "_diagnostics",
+        "_listeners",
+        "_pause_callbacks",
+        "_notification_active",
+        "_notification_payload",
+        "_persist_delay",
+        "_pending_paused",
+        "_persist_handle",
+        "_notify_handle",
+    )
+
     def __init__(
         self,
         hass: HomeAssistant,
@@ -38,17 +55,30 @@ class AutonomyController:
         *,
         initial_paused: bool = False,
         failure_threshold: int = AUTONOMY_FAILURE_THRESHOLD,
+        persist_delay: float = AUTONOMY_PERSIST_DELAY,
     ) -> None:
         self._hass = hass
         self._entry = entry
         self._paused = initial_paused
         self._failure_threshold = max(1, failure_threshold)
+        # Immutable snapshot shared with observers and rebuilt only when it changes.
         self._diagnostics = AutonomyDiagnostics()
-        self._listeners: list[Callable[[], None]] = []
-        self._pause_callbacks: list[
-            Callable[[bool], Awaitable[None] | None]
-        ] = []
+        # Copy-on-write tuples: notifications iterate them without defensive copies.
+        self._listeners: tuple[Callable[[], None], ...] = ()
+        self._pause_callbacks: tuple[Callable[[bool], Awaitable[None] | None], ...] = ()
         self._notification_active = False
+        self._notification_payload = {
+            "title": "Embodied AI connectivity issues",
+            "message": (
+                "The Embodied AI integration has encountered multiple "
+                "communication failures. Autonomy may be degraded."
+            ),
+            "notification_id": f"{NOTIFICATION_AUTONOMY_FAILURE}_{entry.entry_id}",
+        }
+        self._persist_delay = persist_delay
+        self._pending_paused: bool | None = None
+        self._persist_handle: asyncio.TimerHandle | None = None
+        self._notify_handle: asyncio.Handle | None = None
 
     @property
     def entry_id(self) -> str:
@@ -64,7 +94,7 @@ class AutonomyController:
 
     @property
     def diagnostics(self) -> AutonomyDiagnostics:
-        """Return diagnostic information for observers."""
+        """Return a snapshot of diagnostic information for observers."""
 
         return self._diagnostics
 
@@ -77,13 +107,12 @@ class AutonomyController:
     def async_add_listener(self, callback: Callable[[], None]) -> Callable[[], None]:
         """Register a listener invoked when state changes."""
 
-        self._listeners.append(callback)
+        self._listeners = (*self._listeners, callback)
 
         def _remove() -> None:
-            try:
-                self._listeners.remove(callback)
-            except ValueError:  # pragma: no cover - defensive cleanup
-                pass
+            self._listeners = tuple(
+                listener for listener in self._listeners if listener is not callback
+            )
 
         return _remove
 
@@ -92,7 +121,7 @@ class AutonomyController:
     ) -> None:
         """Register callbacks notified when the pause state updates."""
 
-        self._pause_callbacks.extend(callbacks)
+        self._pause_callbacks = (*self._pause_callbacks, *callbacks)
 
     async def async_set_paused(
         self,
@@ -106,42 +135,45 @@ class AutonomyController:
         state_changed = paused != self._paused
         self._paused = paused
         if persist:
-            await self._async_update_entry_options(paused)
+            self._schedule_persist(paused)
         if state_changed or force_notify:
             await self._async_apply_pause_state(paused)
             self._async_notify_listeners()
 
     async def _async_apply_pause_state(self, paused: bool) -> None:
-        for pause_callback in list(self._pause_callbacks):
+        pending: list[Awaitable[None]] = []
+        for pause_callback in self._pause_callbacks:
             try:
                 result = pause_callback(paused)
             except Exception:  # pragma: no cover - defensive logging
                 _LOGGER.exception("Pause callback failed", exc_info=True)
                 continue
             if asyncio.iscoroutine(result):
-                await result
+                pending.append(result)
+        if not pending:
+            return
+        for outcome in await asyncio.gather(*pending, return_exceptions=True):
+            if isinstance(outcome, Exception):
+                _LOGGER.error("Pause callback failed", exc_info=outcome)
 
     @callback
     def record_success(self) -> None:
         """Reset diagnostics on a successful upstream interaction."""
 
-        if self._diagnostics.consecutive_failures == 0 and not self._notification_active:
+        if not self._diagnostics.consecutive_failures and not self._notification_active:
             return
-        self._diagnostics.consecutive_failures = 0
-        self._diagnostics.last_failure = None
-        self._diagnostics.last_source = None
+        self._diagnostics = AutonomyDiagnostics()
         self._notification_active = False
         self._async_notify_listeners()
 
     async def record_failure(self, source: str, message: str) -> None:
         """Increment failure counters and raise notifications as needed."""
 
-        self._diagnostics.consecutive_failures += 1
-        self._diagnostics.last_source = source
-        self._diagnostics.last_failure = message
+        failures = self._diagnostics.consecutive_failures + 1
+        self._diagnostics = AutonomyDiagnostics(failures, message, source)
         self._async_notify_listeners()
 
-        if self._diagnostics.consecutive_failures < self._failure_threshold:
+        if failures < self._failure_threshold:
             return
         if self._notification_active:
             return
@@ -149,24 +181,54 @@ class AutonomyController:
         await self._hass.services.async_call(
             "persistent_notification",
             "create",
-            {
-                "title": "Embodied AI connectivity issues",
-                "message": (
-                    "The Embodied AI integration has encountered multiple "
-                    "communication failures. Autonomy may be degraded."
-                ),
-                "notification_id": f"{NOTIFICATION_AUTONOMY_FAILURE}_{self.entry_id}",
-            },
+            # Service schemas only accept plain dicts, so hand over a fresh copy.
+            dict(self._notification_payload),
             blocking=False,
         )
 
     def _async_notify_listeners(self) -> None:
-        for listener in list(self._listeners):
+        """Schedule one listener pass for every change made in this loop iteration."""
+
+        if self._notify_handle is None:
+            self._notify_handle = self._hass.loop.call_soon(self._flush_listeners)
+
+    def _flush_listeners(self) -> None:
+        self._notify_handle = None
+        for listener in self._listeners:
             try:
                 listener()
             except Exception:  # pragma: no cover - defensive logging
                 _LOGGER.exception("Autonomy listener failed", exc_info=True)
 
+    async def async_shutdown(self) -> None:
+        """Write any pending options change and drop the listener pass on unload."""
+
+        if self._notify_handle is not None:
+            self._notify_handle.cancel()
+            self._notify_handle = None
+        if self._persist_handle is not None:
+            self._persist_handle.cancel()
+            await self._async_flush_persist()
+
+    def _schedule_persist(self, paused: bool) -> None:
+        """Coalesce rapid toggles into a single delayed options write."""
+
+        self._pending_paused = paused
+        if self._persist_handle is not None:
+            self._persist_handle.cancel()
+        self._persist_handle = self._hass.loop.call_later(
+            self._persist_delay,
+            lambda: self._hass.async_create_task(self._async_flush_persist()),
+        )
+
+    async def _async_flush_persist(self) -> None:
+        """Write the most recent pause state into the config entry options."""
+
+        self._persist_handle = None
+        paused, self._pending_paused = self._pending_paused, None
+        if paused is not None:
+            await self._async_update_entry_options(paused)
+
     async def _async_update_entry_options(self, paused: bool) -> None:
         """Persist the autonomy flag into the config entry options."""
 
@@ -174,6 +236,7 @@ class AutonomyController:
         if options.get(OPTIONS_AUTONOMY_PAUSED) == paused:
             return
         options[OPTIONS_AUTONOMY_PAUSED] = paused
+        # The fresh copy is handed over to the config entry and not touched afterwards.
         await self._hass.config_entries.async_update_entry(
             self._entry,
             options=options,
@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 
-import json
-from collections.abc import Mapping
+import re
+from collections.abc import Callable, Mapping
 from typing import Any
 
+import orjson
+
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.const import CONF_HEADERS
@@ -13,9 +15,11 @@ from homeassistant.data_entry_flow import FlowResult
 
 from .const import (
     CONF_AUTH_TOKEN,
+    CONF_BATCH_ENVELOPE,
     CONF_BATCHING,
     CONF_ENDPOINT,
     CONF_EXPOSURE,
+    CONF_FINE_GRAINED_AUDIT,
     CONF_ROUTING,
     CONF_THROTTLE,
     DOMAIN,
@@ -25,6 +29,10 @@ from .const import (
     OPTIONS_MAX_EVENTS_PER_MINUTE,
 )
 
+_find_lines = re.compile(r"[^\r\n]+").finditer
+# Fold commas and carriage returns into newlines so one C-level split tokenizes the input.
+_ITEM_SEPARATORS = str.maketrans(",\r", "\n\n")
+
 
 class AIEmbodiedConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle the initial configuration flow."""
@@ -33,6 +41,8 @@ class AIEmbodiedConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     def __init__(self) -> None:
         self._user_input: dict[str, Any] = {}
+        # Parsed collection fields keyed by field, reused while their raw input is unchanged.
+        self._parsed: dict[str, tuple[Any, Any]] = {}
 
     async def async_step_user(self, user_input: dict[str, Any] | None = None) -> FlowResult:
         """Collect connection, exposure, and routing details."""
@@ -42,15 +52,10 @@ class AIEmbodiedConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             self._user_input.update(user_input)
 
             try:
-                data = _normalize_config_data(self._user_input)
+                data = _normalize_config_data(self._user_input, self._parsed)
             except _ConfigValidationError as err:
                 errors[err.field] = err.reason
             else:
-                existing_entry = self.hass.config_entries.async_entry_for_domain_unique_id(
-                    self.handler, data[CONF_ENDPOINT]
-                )
-                if existing_entry:
-                    return self.async_abort(reason="already_configured")
                 await self.async_set_unique_id(data[CONF_ENDPOINT])
                 self._abort_if_unique_id_configured()
                 return self.async_create_entry(
@@ -111,40 +116,49 @@ class AIEmbodiedOptionsFlowHandler(config_entries.OptionsFlow):
         return self.async_show_form(step_id="init", data_schema=schema, errors=errors)
 
 
+# (marker, key, validator, fallback default) descriptors for each form field.
+_USER_FIELDS: tuple[tuple[Any, str, type, Any], ...] = (
+    (vol.Required, CONF_ENDPOINT, str, ""),
+    (vol.Optional, CONF_AUTH_TOKEN, str, ""),
+    (vol.Optional, CONF_HEADERS, str, ""),
+    (vol.Optional, CONF_EXPOSURE, str, ""),
+    (vol.Optional, CONF_THROTTLE, int, 60),
+    (vol.Optional, CONF_BATCHING, bool, True),
+    # Batched forwards change the upstream wire format, so they stay opt-in.
+    (vol.Optional, CONF_BATCH_ENVELOPE, bool, False),
+    # Per-entity audit events alongside the per-batch one, for existing automations.
+    (vol.Optional, CONF_FINE_GRAINED_AUDIT, bool, True),
+    (vol.Optional, CONF_ROUTING, str, ""),
+)
+_OPTIONS_FIELDS: tuple[tuple[Any, str, type, Any], ...] = (
+    (vol.Optional, OPTIONS_DEBUG, bool, False),
+    (vol.Optional, OPTIONS_MAX_EVENTS_PER_MINUTE, int, 120),
+    (vol.Optional, OPTIONS_BURST_SIZE, int, 10),
+    (vol.Optional, OPTIONS_AUTONOMY_PAUSED, bool, False),
+)
+
+
 def _build_user_schema(current: Mapping[str, Any]) -> vol.Schema:
     """Construct the schema for the primary config step."""
 
-    return vol.Schema(
-        {
-            vol.Required(CONF_ENDPOINT, default=current.get(CONF_ENDPOINT, "")): str,
-            vol.Optional(CONF_AUTH_TOKEN, default=current.get(CONF_AUTH_TOKEN, "")): str,
-            vol.Optional(CONF_HEADERS, default=current.get(CONF_HEADERS, "")): str,
-            vol.Optional(CONF_EXPOSURE, default=current.get(CONF_EXPOSURE, "")): str,
-            vol.Optional(CONF_THROTTLE, default=current.get(CONF_THROTTLE, 60)): int,
-            vol.Optional(CONF_BATCHING, default=current.get(CONF_BATCHING, True)): bool,
-            vol.Optional(CONF_ROUTING, default=current.get(CONF_ROUTING, "")): str,
-        }
-    )
+    return _schema_with_defaults(_USER_FIELDS, current)
 
 
 def _build_options_schema(current: Mapping[str, Any]) -> vol.Schema:
     """Construct the schema for the options flow."""
 
+    return _schema_with_defaults(_OPTIONS_FIELDS, current)
+
+
+def _schema_with_defaults(
+    fields: tuple[tuple[Any, str, type, Any], ...], current: Mapping[str, Any]
+) -> vol.Schema:
+    """Build a form schema from field descriptors, defaulting to the current values."""
+
     return vol.Schema(
         {
-            vol.Optional(OPTIONS_DEBUG, default=current.get(OPTIONS_DEBUG, False)): bool,
-            vol.Optional(
-                OPTIONS_MAX_EVENTS_PER_MINUTE,
-                default=current.get(OPTIONS_MAX_EVENTS_PER_MINUTE, 120),
-            ): int,
-            vol.Optional(
-                OPTIONS_BURST_SIZE,
-                default=current.get(OPTIONS_BURST_SIZE, 10),
-            ): int,
-            vol.Optional(
-                OPTIONS_AUTONOMY_PAUSED,
-                default=current.get(OPTIONS_AUTONOMY_PAUSED, False),
-            ): bool,
+            marker(key, default=current.get(key, fallback)): validator
+            for marker, key, validator, fallback in fields
         }
     )
 
@@ -158,8 +172,14 @@ class _ConfigValidationError(Exception):
         self.reason = reason
 
 
-def _normalize_config_data(user_input: Mapping[str, Any]) -> dict[str, Any]:
-    """Parse and validate the primary config flow input."""
+def _normalize_config_data(
+    user_input: Mapping[str, Any], parsed: dict[str, tuple[Any, Any]] | None = None
+) -> dict[str, Any]:
+    """Parse and validate the primary config flow input.
+
+    ``parsed`` carries results from earlier submissions of the same flow so a
+    retry only re-parses the collection fields whose raw input changed.
+    """
 
     endpoint = str(user_input.get(CONF_ENDPOINT, "")).strip()
     if not endpoint:
@@ -167,28 +187,27 @@ def _normalize_config_data(user_input: Mapping[str, Any]) -> dict[str, Any]:
 
     headers_raw = user_input.get(CONF_HEADERS, "")
     try:
-        headers = _parse_mapping(headers_raw)
+        headers = _parse_field(parsed, CONF_HEADERS, headers_raw, _parse_mapping)
     except ValueError as err:
         raise _ConfigValidationError(CONF_HEADERS, "invalid_headers") from err
 
     exposure_raw = user_input.get(CONF_EXPOSURE, "")
-    exposure = _parse_string_collection(exposure_raw)
+    exposure = _parse_field(parsed, CONF_EXPOSURE, exposure_raw, _parse_string_collection)
 
     routing_raw = user_input.get(CONF_ROUTING, "")
     try:
-        routing = _parse_mapping(routing_raw)
+        routing = _parse_field(parsed, CONF_ROUTING, routing_raw, _parse_mapping)
     except ValueError as err:  # pragma: no cover - defensive (routing rarely manual)
         raise _ConfigValidationError(CONF_ROUTING, "invalid_routing") from err
 
-    throttle = user_input.get(CONF_THROTTLE)
     try:
-        throttle_value = int(throttle)
-    except (TypeError, ValueError):
-        raise _ConfigValidationError(CONF_THROTTLE, "invalid_throttle")
-    if throttle_value <= 0:
-        raise _ConfigValidationError(CONF_THROTTLE, "invalid_throttle")
+        throttle_value = _coerce_positive_int(user_input.get(CONF_THROTTLE))
+    except (TypeError, ValueError) as err:
+        raise _ConfigValidationError(CONF_THROTTLE, "invalid_throttle") from err
 
     batching = bool(user_input.get(CONF_BATCHING, True))
+    batch_envelope = bool(user_input.get(CONF_BATCH_ENVELOPE, False))
+    fine_grained_audit = bool(user_input.get(CONF_FINE_GRAINED_AUDIT, True))
 
     return {
         CONF_ENDPOINT: endpoint,
@@ -197,61 +216,84 @@ def _normalize_config_data(user_input: Mapping[str, Any]) -> dict[str, Any]:
         CONF_EXPOSURE: exposure,
         CONF_THROTTLE: throttle_value,
         CONF_BATCHING: batching,
+        CONF_BATCH_ENVELOPE: batch_envelope,
+        CONF_FINE_GRAINED_AUDIT: fine_grained_audit,
         CONF_ROUTING: routing,
     }
 
 
+def _parse_field(
+    parsed: dict[str, tuple[Any, Any]] | None,
+    field: str,
+    raw: Any,
+    parser: Callable[[Any], Any],
+) -> Any:
+    """Parse a raw field value, reusing the previous result if the input is unchanged."""
+
+    if parsed is None:
+        return parser(raw)
+    previous = parsed.get(field)
+    if previous is not None and previous[0] == raw:
+        return previous[1]
+    value = parser(raw)
+    parsed[field] = (raw, value)
+    return value
+
+
 def _parse_mapping(value: Any) -> dict[str, str]:
     """Parse mapping style input from JSON or newline-delimited pairs."""
 
     if isinstance(value, Mapping):
-        return {str(key): str(val) for key, val in value.items()}
+        return _stringify_mapping(value)
 
     text = str(value or "").strip()
     if not text:
         return {}
 
     try:
-        parsed = json.loads(text)
-    except json.JSONDecodeError:
+        parsed = orjson.loads(text)
+    except orjson.JSONDecodeError:
         pairs: dict[str, str] = {}
-        for line in text.splitlines():
+        for match in _find_lines(text):
+            line = match.group()
             if not line.strip():
                 continue
-            if ":" not in line:
+            key, sep, val = line.partition(":")
+            if not sep:
                 raise ValueError(f"Invalid mapping line: {line}")
-            key, val = line.split(":", 1)
             key = key.strip()
-            val = val.strip()
             if not key:
                 raise ValueError("Empty key in mapping")
-            pairs[key] = val
+            pairs[key] = val.strip()
         return pairs
     else:
         if not isinstance(parsed, dict):
             raise ValueError("Expected mapping JSON")
-        return {str(key): str(val) for key, val in parsed.items()}
+        return _stringify_mapping(parsed)
+
+
+def _stringify_mapping(value: Mapping[Any, Any]) -> dict[str, str]:
+    """Copy a mapping with string keys and values, skipping str() for existing strings."""
+
+    return {
+        key if type(key) is str else str(key): val if type(val) is str else str(val)
+        for key, val in value.items()
+    }
 
 
 def _parse_string_collection(value: Any) -> list[str]:
     """Parse comma or newline separated string values."""
 
     if isinstance(value, list):
-        items = [str(item).strip() for item in value]
-    else:
-        text = str(value or "")
-        separators = [",", "\n"]
-        for sep in separators:
-            text = text.replace(sep, "\n")
-        items = [item.strip() for item in text.splitlines()]
-
-    return [item for item in items if item]
+        return [item for item in (str(raw).strip() for raw in value) if item]
+    parts = str(value or "").translate(_ITEM_SEPARATORS).split("\n")
+    return [item for item in (part.strip() for part in parts) if item]
 
 
 def _coerce_positive_int(value: Any) -> int:
     """Convert a value to a positive integer or raise."""
 
-    number = int(value)
+    number = value if type(value) is int else int(value)
     if number <= 0:
         raise ValueError("Expected positive integer")
     return number
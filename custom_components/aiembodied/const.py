@@ -5,7 +5,6 @@ from __future__ import annotations
 from typing import Final
 
 DOMAIN: Final = "aiembodied"
-DATA_RUNTIME: Final = "runtime"
 DEFAULT_TIMEOUT: Final = 10
 
 CONF_ENDPOINT: Final = "endpoint"
@@ -14,6 +13,8 @@ CONF_HEADERS: Final = "headers"
 CONF_EXPOSURE: Final = "exposure"
 CONF_THROTTLE: Final = "throttle"
 CONF_BATCHING: Final = "batching"
+CONF_BATCH_ENVELOPE: Final = "batch_envelope"
+CONF_FINE_GRAINED_AUDIT: Final = "fine_grained_audit"
 CONF_ROUTING: Final = "routing"
 
 OPTIONS_DEBUG: Final = "debug"
@@ -21,13 +22,16 @@ OPTIONS_MAX_EVENTS_PER_MINUTE: Final = "max_events_per_minute"
 OPTIONS_BURST_SIZE: Final = "burst_size"
 OPTIONS_AUTONOMY_PAUSED: Final = "autonomy_paused"
 
-RUNTIME_DATA_CLIENT: Final = "client"
-RUNTIME_DATA_CONFIG: Final = "config"
-RUNTIME_DATA_OPTIONS: Final = "options"
-RUNTIME_DATA_AUTONOMY: Final = "autonomy"
-
 SIGNAL_AUTONOMY_STATE_CHANGED: Final = "autonomy_state_changed"
 SIGNAL_DIAGNOSTICS_UPDATED: Final = "diagnostics_updated"
 
+EVENT_ACTION_EXECUTED: Final = f"{DOMAIN}.action_executed"
+EVENT_UPDATE_FORWARDED: Final = f"{DOMAIN}.update_forwarded"
+EVENT_UPDATES_FORWARDED: Final = f"{DOMAIN}.updates_forwarded"
+EVENT_UPDATES_DROPPED: Final = f"{DOMAIN}.updates_dropped"
+
 NOTIFICATION_AUTONOMY_FAILURE: Final = "aiembodied_autonomy_failure"
 AUTONOMY_FAILURE_THRESHOLD: Final = 3
+AUTONOMY_PERSIST_DELAY: Final = 1.5
+EXPOSURE_BATCH_DELAY: Final = 0.05
+EXPOSURE_MAX_IN_FLIGHT: Final = 16
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from types import MappingProxyType
 from typing import TYPE_CHECKING, Any, Mapping
 
 from homeassistant.components import conversation
@@ -12,12 +13,16 @@ if TYPE_CHECKING:  # pragma: no cover - imports for type checking only
     from . import IntegrationConfig
 
 
+_RESPONSE_TEXT_KEYS = ("reply", "text", "response", "message")
+
+
 class AIEmbodiedConversationAgent(conversation.AbstractConversationAgent):
     """Home Assistant conversation agent backed by the Embodied AI service."""
 
     def __init__(self, client: AIEmbodiedClient, config: "IntegrationConfig") -> None:
         self._client = client
         self._config = config
+        self._config_block = _build_config_block(config)
 
     @property
     def supported_languages(self) -> set[str]:
@@ -64,15 +69,6 @@ class AIEmbodiedConversationAgent(conversation.AbstractConversationAgent):
     def _build_payload(self, user_input: conversation.ConversationInput) -> Mapping[str, Any]:
         """Construct the payload sent to the upstream service."""
 
-        config_block: dict[str, Any] = {
-            "exposure": list(self._config.exposure),
-            "batching": self._config.batching,
-        }
-        if self._config.throttle is not None:
-            config_block["throttle"] = self._config.throttle
-        if self._config.routing:
-            config_block["routing"] = dict(self._config.routing)
-
         payload: dict[str, Any] = {
             "input": {
                 "text": user_input.text,
@@ -80,7 +76,7 @@ class AIEmbodiedConversationAgent(conversation.AbstractConversationAgent):
                 "language": user_input.language,
                 "device_id": user_input.device_id,
             },
-            "config": config_block,
+            "config": self._config_block,
         }
 
         context = self._serialize_context(user_input.context)
@@ -96,22 +92,22 @@ class AIEmbodiedConversationAgent(conversation.AbstractConversationAgent):
             return None
 
         result: dict[str, Any] = {}
-        for attr in ("id", "user_id", "parent_id"):
-            value = getattr(context, attr, None)
-            if value is not None:
-                result[attr] = value
+        if (context_id := context.id) is not None:
+            result["id"] = context_id
+        if (user_id := context.user_id) is not None:
+            result["user_id"] = user_id
+        # parent_id is missing from older cores, so it is the only attribute probed.
+        if (parent_id := getattr(context, "parent_id", None)) is not None:
+            result["parent_id"] = parent_id
         return result or None
 
     def _extract_response_text(self, response: Mapping[str, Any]) -> str | None:
         """Normalize textual content from the upstream response."""
 
-        candidates: list[Any] = [
-            response.get("reply"),
-            response.get("text"),
-            response.get("response"),
-            response.get("message"),
-        ]
-        for candidate in candidates:
+        for key in _RESPONSE_TEXT_KEYS:
+            candidate = response.get(key)
+            if candidate is None:
+                continue
             text = self._coerce_text(candidate)
             if text:
                 return text
@@ -135,8 +131,27 @@ class AIEmbodiedConversationAgent(conversation.AbstractConversationAgent):
 
         if isinstance(candidate, str):
             return candidate.strip() or None
-        if isinstance(candidate, Mapping):
+        # Decoded JSON is always a plain dict; skip the ABC check for it.
+        if type(candidate) is dict or isinstance(candidate, Mapping):
             inner = candidate.get("text")
             if isinstance(inner, str):
                 return inner.strip() or None
         return None
+
+
+def _build_config_block(config: "IntegrationConfig") -> Mapping[str, Any]:
+    """Build the static config section of each request from the frozen entry config.
+
+    The client encodes tuples and read-only mappings directly, so the exposure
+    and routing values are referenced rather than copied.
+    """
+
+    config_block: dict[str, Any] = {
+        "exposure": config.exposure,
+        "batching": config.batching,
+    }
+    if config.throttle is not None:
+        config_block["throttle"] = config.throttle
+    if config.routing:
+        config_block["routing"] = config.routing
+    return MappingProxyType(config_block)
@@ -2,16 +2,33 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Any, Callable, Iterable
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Sequence
 
 from homeassistant.core import Context, Event, HomeAssistant, State, callback
-from homeassistant.helpers.event import MATCH_ALL, async_track_state_change_event
-
-from .api_client import AIEmbodiedClient, AIEmbodiedClientError
+from homeassistant.helpers.event import (
+    TrackStates,
+    async_track_state_change_event,
+    async_track_state_change_filtered,
+)
+
+try:
+    from homeassistant.helpers import area_registry as ar
+    from homeassistant.helpers import entity_registry as er
+except ImportError:  # pragma: no cover - registries are absent from the test stubs
+    ar = er = None
+
+from .api_client import AIEmbodiedClient, AIEmbodiedClientError, AIEmbodiedThrottledError
 from .autonomy import AutonomyController
-from .const import DOMAIN
+from .const import (
+    EVENT_UPDATE_FORWARDED,
+    EVENT_UPDATES_DROPPED,
+    EVENT_UPDATES_FORWARDED,
+    EXPOSURE_BATCH_DELAY,
+    EXPOSURE_MAX_IN_FLIGHT,
+)
 
 if TYPE_CHECKING:  # pragma: no cover - imported for typing only
     from . import IntegrationConfig
@@ -19,13 +36,16 @@ if TYPE_CHECKING:  # pragma: no cover - imported for typing only
 
 _LOGGER = logging.getLogger(__name__)
 
+# Far above the entity count of a real install; only guards against unbounded growth.
+_ENTITY_CACHE_MAX_ENTRIES = 4096
+
 
-@dataclass(slots=True)
+@dataclass(slots=True, frozen=True)
 class _ExposureFilters:
     """Preprocessed filters for determining entity forwarding eligibility."""
 
-    entities: set[str]
-    domains: set[str]
+    entities: frozenset[str]
+    domains: frozenset[str]
 
     @classmethod
     def from_iterable(cls, exposure: Iterable[str]) -> "_ExposureFilters":
@@ -36,22 +56,15 @@ class _ExposureFilters:
             normalized = item.strip().lower()
             if not normalized:
                 continue
-            if normalized.endswith(".*"):
-                domains.add(normalized[:-2])
-                continue
-            if "." not in normalized:
+            head, sep, tail = normalized.rpartition(".")
+            if not sep:
                 domains.add(normalized)
-                continue
-            entities.add(normalized)
-
-        return cls(entities=entities, domains=domains)
+            elif tail == "*":
+                domains.add(head)
+            else:
+                entities.add(normalized)
 
-    def allows(self, entity_id: str) -> bool:
-        entity_lower = entity_id.lower()
-        if entity_lower in self.entities:
-            return True
-        domain = entity_lower.split(".", 1)[0]
-        return domain in self.domains
+        return cls(entities=frozenset(entities), domains=frozenset(domains))
 
 
 class ExposureController:
@@ -73,21 +86,44 @@ class ExposureController:
         self._unsubscribe: Callable[[], None] | None = None
         self._autonomy = autonomy
         self._paused = False
+        self._pending: list[dict[str, Any]] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._in_flight = 0
+        self._dropped = 0
+        # Resolved area names by entity id, cleared when either registry changes.
+        self._area_cache: dict[str, str | None] = {}
+        # Per-entity payload fields that only change on rename or re-area.
+        self._static_fields: dict[str, dict[str, Any]] = {}
+        self._registry_unsubscribes: list[Callable[[], None]] = []
 
     async def async_setup(self) -> None:
         """Attach listeners when exposures are configured."""
 
-        if not self._filters.entities and not self._filters.domains:
-            return
-        if self._unsubscribe is not None:
-            return
-        self._unsubscribe = async_track_state_change_event(
-            self._hass, MATCH_ALL, self._handle_state_change
-        )
+        if self._autonomy is not None and self._autonomy.paused:
+            # Entries restored while paused subscribe on resume instead.
+            self._paused = True
+        else:
+            self._subscribe()
+        if er is not None and not self._registry_unsubscribes:
+            bus = self._hass.bus
+            self._registry_unsubscribes = [
+                bus.async_listen(er.EVENT_ENTITY_REGISTRY_UPDATED, self._handle_entity_registry),
+                bus.async_listen(ar.EVENT_AREA_REGISTRY_UPDATED, self._handle_area_registry),
+            ]
 
     async def async_shutdown(self) -> None:
         """Tear down listeners when the config entry unloads."""
 
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+            _LOGGER.debug("Dropping %d batched updates on shutdown", len(self._pending))
+            self._pending = []
+        for unsubscribe in self._registry_unsubscribes:
+            unsubscribe()
+        self._registry_unsubscribes = []
+        self._area_cache.clear()
+        self._static_fields.clear()
         if self._unsubscribe is None:
             return
         self._unsubscribe()
@@ -105,51 +141,166 @@ class ExposureController:
                 self._unsubscribe = None
             return
 
-        if self._filters.entities or self._filters.domains:
-            if self._unsubscribe is None:
-                self._unsubscribe = async_track_state_change_event(
-                    self._hass, MATCH_ALL, self._handle_state_change
-                )
+        self._subscribe()
+
+    def _subscribe(self) -> None:
+        """Listen for state changes of the exposed entities only.
+
+        Home Assistant dispatches state changes by entity id, so narrow listeners
+        are never woken for unrelated entities. Domain filters use the filtered
+        tracker, which also follows entities added to those domains later.
+        """
+
+        if self._unsubscribe is not None:
+            return
+        entities, domains = self._filters.entities, self._filters.domains
+        if domains:
+            tracker = async_track_state_change_filtered(
+                self._hass,
+                TrackStates(False, set(entities), set(domains)),
+                self._handle_state_change,
+            )
+            self._unsubscribe = tracker.async_remove
+        elif entities:
+            self._unsubscribe = async_track_state_change_event(
+                self._hass, sorted(entities), self._handle_state_change
+            )
+
+    @callback
+    def _handle_entity_registry(self, event: Event) -> None:
+        """Forget the cached area of an entity whose registry entry changed."""
+
+        for key in (event.data.get("entity_id"), event.data.get("old_entity_id")):
+            self._area_cache.pop(key, None)
+            self._static_fields.pop(key, None)
+
+    @callback
+    def _handle_area_registry(self, event: Event) -> None:
+        """Drop all cached areas; a renamed or removed area affects many entities."""
+
+        self._area_cache.clear()
+        self._static_fields.clear()
 
     @callback
     def _handle_state_change(self, event: Event) -> None:
+        # Listeners only receive exposed entities, so just the pause flag is checked.
         entity_id: str | None = event.data.get("entity_id")
-        if not entity_id or not self._filters.allows(entity_id):
-            return
-        if self._paused:
+        if not entity_id or self._paused:
             return
 
         old_state: State | None = event.data.get("old_state")
         new_state: State | None = event.data.get("new_state")
+        if (
+            old_state is not None
+            and new_state is not None
+            and old_state.state == new_state.state
+            and (
+                old_state.attributes is new_state.attributes
+                or old_state.attributes == new_state.attributes
+            )
+        ):
+            # Only the timestamps or context moved (e.g. force_update); nothing to report.
+            return
 
         payload = self._build_payload(entity_id, old_state, new_state, event.context)
-        self._hass.async_create_task(self._async_forward(payload))
+        if not self._config.batch_envelope:
+            self._start_forward(payload, (payload,))
+            return
 
-    async def _async_forward(self, payload: dict[str, Any]) -> None:
-        """Send the normalized update to the upstream service and emit audit events."""
+        self._pending.append(payload)
+        if self._flush_handle is None:
+            self._flush_handle = self._hass.loop.call_later(
+                EXPOSURE_BATCH_DELAY, self._flush_pending
+            )
 
-        audit: dict[str, Any] = {
-            "entry_id": self._entry_id,
-            "entity_id": payload["data"]["entity_id"],
-            "domain": payload["data"]["domain"],
-        }
+    @callback
+    def _flush_pending(self) -> None:
+        """Send every update queued since the first one of a burst in one request."""
 
+        self._flush_handle = None
+        events, self._pending = self._pending, []
+        if events:
+            self._start_forward({"type": "batch", "events": events}, events)
+
+    def _start_forward(self, body: dict[str, Any], events: Sequence[dict[str, Any]]) -> None:
+        """Forward updates in the background, dropping them while upstream is saturated."""
+
+        if self._in_flight >= EXPOSURE_MAX_IN_FLIGHT:
+            self._record_dropped(len(events))
+            return
+        self._in_flight += 1
+        self._hass.async_create_task(self._async_forward(body, events))
+
+    def _record_dropped(self, count: int) -> None:
+        """Count updates that were never sent and report the running total."""
+
+        dropped = self._dropped + count
+        # Report on the first drop and whenever the total crosses another hundred.
+        if not self._dropped or dropped // 100 > self._dropped // 100:
+            _LOGGER.warning(
+                "Upstream is not keeping up; dropping updates (%d dropped so far)",
+                dropped,
+            )
+            self._hass.bus.async_fire(
+                EVENT_UPDATES_DROPPED, {"entry_id": self._entry_id, "dropped": dropped}
+            )
+        self._dropped = dropped
+
+    async def _async_forward(
+        self, body: dict[str, Any], events: Sequence[dict[str, Any]]
+    ) -> None:
+        """Send normalized updates to the upstream service and emit audit events."""
+
+        error: str | None = None
         try:
-            await self._client.async_post_json(payload)
+            await self._client.async_post_json(body, throttled=True)
+        except AIEmbodiedThrottledError:
+            # Rejected by our own rate limit; upstream never saw it, so its health is unknown.
+            self._record_dropped(len(events))
+            return
         except AIEmbodiedClientError as exc:
-            audit["success"] = False
-            audit["error"] = str(exc)
+            error = str(exc)
             if self._autonomy is not None:
-                await self._autonomy.record_failure("event_forward", str(exc))
+                await self._autonomy.record_failure("event_forward", error)
             _LOGGER.warning(
-                "Failed to forward update for %s: %s", audit["entity_id"], exc, exc_info=True
+                "Failed to forward %d update(s) starting with %s: %s",
+                len(events),
+                events[0]["data"]["entity_id"],
+                exc,
+                exc_info=True,
             )
         else:
-            audit["success"] = True
             if self._autonomy is not None:
                 self._autonomy.record_success()
-
-        self._hass.bus.async_fire(f"{DOMAIN}.update_forwarded", audit)
+        finally:
+            self._in_flight -= 1
+
+        if body["type"] == "batch":
+            # One audit event per request keeps bus wake-ups independent of batch size.
+            batch_audit: dict[str, Any] = {
+                "entry_id": self._entry_id,
+                "success": error is None,
+                "results": [
+                    {"entity_id": payload["data"]["entity_id"], "domain": payload["data"]["domain"]}
+                    for payload in events
+                ],
+            }
+            if error is not None:
+                batch_audit["error"] = error
+            self._hass.bus.async_fire(EVENT_UPDATES_FORWARDED, batch_audit)
+            if not self._config.fine_grained_audit:
+                return
+
+        for payload in events:
+            audit: dict[str, Any] = {
+                "entry_id": self._entry_id,
+                "entity_id": payload["data"]["entity_id"],
+                "domain": payload["data"]["domain"],
+                "success": error is None,
+            }
+            if error is not None:
+                audit["error"] = error
+            self._hass.bus.async_fire(EVENT_UPDATE_FORWARDED, audit)
 
     def _build_payload(
         self,
@@ -160,20 +311,23 @@ class ExposureController:
     ) -> dict[str, Any]:
         """Construct the structured payload sent to the upstream service."""
 
-        domain = entity_id.split(".", 1)[0]
         friendly_name = self._determine_friendly_name(new_state, old_state)
-        area = self._resolve_area(entity_id)
-
-        data: dict[str, Any] = {
-            "entry_id": self._entry_id,
-            "entity_id": entity_id,
-            "domain": domain,
-            "friendly_name": friendly_name,
-            "area": area,
-            "state": {
-                "old": self._serialize_state(old_state),
-                "new": self._serialize_state(new_state),
-            },
+        static = self._static_fields.get(entity_id)
+        if static is None or static["friendly_name"] != friendly_name:
+            if len(self._static_fields) >= _ENTITY_CACHE_MAX_ENTRIES:
+                self._static_fields.clear()
+            static = self._static_fields[entity_id] = {
+                "entry_id": self._entry_id,
+                "entity_id": entity_id,
+                "domain": entity_id.partition(".")[0],
+                "friendly_name": friendly_name,
+                "area": self._resolve_area(entity_id),
+            }
+
+        data = static.copy()
+        data["state"] = {
+            "old": self._serialize_state(old_state),
+            "new": self._serialize_state(new_state),
         }
 
         context_dict = self._serialize_context(context)
@@ -189,16 +343,22 @@ class ExposureController:
     @staticmethod
     def _determine_friendly_name(new_state: State | None, old_state: State | None) -> str | None:
         for candidate in (new_state, old_state):
-            if candidate is None:
-                continue
-            if candidate.name:
-                return candidate.name
+            if candidate is not None and (name := candidate.name):
+                return name
         return None
 
     def _resolve_area(self, entity_id: str) -> str | None:
         try:
-            from homeassistant.helpers import entity_registry as er  # type: ignore
-        except ImportError:  # pragma: no cover - optional dependency in stub tests
+            return self._area_cache[entity_id]
+        except KeyError:
+            pass
+        area = self._lookup_area(entity_id)
+        if self._registry_unsubscribes:
+            self._area_cache[entity_id] = area
+        return area
+
+    def _lookup_area(self, entity_id: str) -> str | None:
+        if er is None:
             return None
 
         try:
@@ -210,11 +370,6 @@ class ExposureController:
         if entry is None or entry.area_id is None:
             return None
 
-        try:
-            from homeassistant.helpers import area_registry as ar  # type: ignore
-        except ImportError:  # pragma: no cover - optional dependency in stub tests
-            return entry.area_id
-
         try:
             area_registry = ar.async_get(self._hass)
         except Exception:  # pragma: no cover - registry lookup unavailable in tests
@@ -231,9 +386,11 @@ class ExposureController:
             return None
         return {
             "state": state.state,
-            "attributes": dict(state.attributes),
-            "last_changed": state.last_changed.isoformat(),
-            "last_updated": state.last_updated.isoformat(),
+            # Core state attributes are read-only; the client encodes them in place.
+            "attributes": state.attributes,
+            # orjson writes datetimes as RFC 3339, the same text isoformat() produces.
+            "last_changed": state.last_changed,
+            "last_updated": state.last_updated,
         }
 
     @staticmethod
@@ -241,8 +398,11 @@ class ExposureController:
         if context is None:
             return None
         result: dict[str, str] = {}
-        for attr in ("id", "user_id", "parent_id"):
-            value = getattr(context, attr, None)
-            if isinstance(value, str) and value:
-                result[attr] = value
+        if context_id := context.id:
+            result["id"] = context_id
+        if user_id := context.user_id:
+            result["user_id"] = user_id
+        # parent_id is missing from older cores, so it is the only attribute probed.
+        if parent_id := getattr(context, "parent_id", None):
+            result["parent_id"] = parent_id
         return result or None
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Any, Callable, cast
+from typing import Any, Callable
 
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.config_entries import ConfigEntry
@@ -10,7 +10,7 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity import EntityCategory
 
 from . import RuntimeData
-from .const import DATA_RUNTIME, DOMAIN
+from .const import DOMAIN
 
 
 async def async_setup_entry(
@@ -20,13 +20,7 @@ async def async_setup_entry(
 ) -> None:
     """Set up diagnostic sensors."""
 
-    runtime_wrapper = hass.data.get(DOMAIN, {}).get(entry.entry_id)
-    if not runtime_wrapper:
-        return
-    runtime = cast(RuntimeData | None, runtime_wrapper.get(DATA_RUNTIME))
-    if runtime is None:
-        return
-
+    runtime: RuntimeData = hass.data[DOMAIN][entry.entry_id]
     async_add_entities([AIEmbodiedFailureSensor(entry, runtime)])
 
 
@@ -64,11 +58,9 @@ class AIEmbodiedFailureSensor(SensorEntity):
 
     async def async_added_to_hass(self) -> None:
         await super().async_added_to_hass()
-
-        def _update() -> None:
-            self.async_write_ha_state()
-
-        self._remove_listener = self._runtime.autonomy.async_add_listener(_update)
+        self._remove_listener = self._runtime.autonomy.async_add_listener(
+            self.async_write_ha_state
+        )
 
     async def async_will_remove_from_hass(self) -> None:
         await super().async_will_remove_from_hass()
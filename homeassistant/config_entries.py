@@ -4,6 +4,8 @@ from __future__ import annotations
 
 from typing import Any, Awaitable, Callable
 
+from .data_entry_flow import AbortFlow
+
 
 class ConfigEntry:
     """Minimal stub of Home Assistant's ConfigEntry."""
@@ -71,7 +73,12 @@ class ConfigFlow:
         self._unique_id = unique_id
 
     def _abort_if_unique_id_configured(self) -> None:
-        return None
+        if self._unique_id is None:
+            return
+        if self.hass.config_entries.async_entry_for_domain_unique_id(
+            self.handler, self._unique_id
+        ):
+            raise AbortFlow("already_configured")
 
 
 class OptionsFlow:
@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+import asyncio
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Any, Callable, TypeVar
 
@@ -14,6 +15,12 @@ class HomeAssistant:
         self.data: dict[str, dict[str, Any]] = {}
         self.config_entries: Any = None
 
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """Return the running event loop."""
+
+        return asyncio.get_running_loop()
+
 
 @dataclass(slots=True)
 class Context:
@@ -47,12 +54,17 @@ class State:
     entity_id: str
     state: str
     attributes: dict[str, Any]
-    last_changed: datetime = field(
-        default_factory=lambda: datetime.now(timezone.utc)
-    )
-    last_updated: datetime = field(
-        default_factory=lambda: datetime.now(timezone.utc)
-    )
+    last_changed: datetime = None  # type: ignore[assignment]
+    last_updated: datetime = None  # type: ignore[assignment]
+
+    def __post_init__(self) -> None:
+        # Like core, both timestamps default to a single "now" reading.
+        if self.last_changed is None or self.last_updated is None:
+            now = datetime.now(timezone.utc)
+            if self.last_changed is None:
+                self.last_changed = now
+            if self.last_updated is None:
+                self.last_updated = now
 
     @property
     def name(self) -> str | None:
@@ -15,3 +15,11 @@ class FlowResultType(StrEnum):
 
 
 FlowResult = Dict[str, Any]
+
+
+class AbortFlow(Exception):
+    """Raised by flow helpers to abort the current flow."""
+
+    def __init__(self, reason: str) -> None:
+        super().__init__(f"Flow aborted: {reason}")
+        self.reason = reason
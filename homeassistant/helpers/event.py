@@ -2,14 +2,41 @@
 
 from __future__ import annotations
 
-from typing import Any, Callable, Iterable
+from typing import Any, Callable, Iterable, NamedTuple
 
 MATCH_ALL: object = object()
 
 
+class TrackStates(NamedTuple):
+    """Entities and domains tracked by a filtered state change listener."""
+
+    all_states: bool
+    entities: set[str]
+    domains: set[str]
+
+
+class _TrackStateChangeFiltered:
+    """Handle returned by ``async_track_state_change_filtered``."""
+
+    def __init__(self, track_states: TrackStates, action: Callable[[Any], Any]) -> None:
+        self.track_states = track_states
+        self.action = action
+
+    def async_remove(self) -> None:
+        """Cancel the listener (no-op in the stub)."""
+
+
 def async_track_state_change_event(
     hass: Any, entity_ids: Iterable[str] | object, action: Callable[[Any], Any]
 ) -> Callable[[], None]:
     """Register a state change listener (no-op in the stub)."""
 
     return lambda: None
+
+
+def async_track_state_change_filtered(
+    hass: Any, track_states: TrackStates, action: Callable[[Any], Any]
+) -> _TrackStateChangeFiltered:
+    """Register a listener for the given entities and domains (no-op in the stub)."""
+
+    return _TrackStateChangeFiltered(track_states, action)
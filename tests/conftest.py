@@ -7,23 +7,31 @@ from collections.abc import Callable
 
 import pytest
 
+# One loop is shared by every coroutine test in the session (per xdist worker); no test leaves
+# work scheduled past its own body, so there is nothing for a per-test loop teardown to reap.
+# Under xdist, run with --dist=loadfile: test modules are the sharding unit and keep their
+# module-level stubs and configs on one worker. No test depends on worker identity.
+_loop: asyncio.AbstractEventLoop | None = None
+
 
 @pytest.hookimpl(tryfirst=True)
 def pytest_pyfunc_call(pyfuncitem: pytest.Function) -> bool | None:
-    """Execute coroutine test functions using a local event loop."""
+    """Execute coroutine test functions on the session event loop."""
 
+    global _loop
     test_function: Callable[..., object] = pyfuncitem.obj
     if asyncio.iscoroutinefunction(test_function):
-        loop = asyncio.new_event_loop()
-        try:
-            loop.run_until_complete(test_function(**pyfuncitem.funcargs))
-        finally:
-            loop.close()
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+        _loop.run_until_complete(test_function(**pyfuncitem.funcargs))
         return True
     return None
 
 
-def pytest_configure(config: pytest.Config) -> None:
-    """Register custom markers used in the test suite."""
+def pytest_unconfigure(config: pytest.Config) -> None:
+    """Close the session event loop once the run is over."""
 
-    config.addinivalue_line("markers", "asyncio: mark test as asynchronous")
+    global _loop
+    if _loop is not None:
+        _loop.close()
+        _loop = None
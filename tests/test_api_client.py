@@ -2,15 +2,20 @@
 
 from __future__ import annotations
 
+import asyncio
+from datetime import datetime, timezone
+from types import MappingProxyType
 from typing import Any
 
+import orjson
 import pytest
 
-from aiohttp import ClientError
+from aiohttp import ClientError, ClientTimeout
 from custom_components.aiembodied.api_client import (
     AIEmbodiedClient,
     AIEmbodiedClientConfig,
     AIEmbodiedClientError,
+    AIEmbodiedThrottledError,
 )
 
 
@@ -31,8 +36,8 @@ class _StubResponse:
         if self.status >= 400:
             raise ClientError(f"HTTP {self.status}")
 
-    async def json(self) -> dict[str, Any]:
-        return self._payload
+    async def read(self) -> bytes:
+        return orjson.dumps(self._payload)
 
 
 class _StubSession:
@@ -49,13 +54,13 @@ class _StubSession:
         self,
         url: str,
         *,
-        json: dict[str, Any],
+        data: bytes,
         headers: dict[str, str],
-        timeout: float,
+        timeout: ClientTimeout,
     ) -> _StubResponse:
         self.requests.append({
             "url": url,
-            "json": json,
+            "json": orjson.loads(data),
             "headers": headers,
             "timeout": timeout,
         })
@@ -64,7 +69,6 @@ class _StubSession:
         return self._response
 
 
-@pytest.mark.asyncio
 async def test_async_post_json_merges_headers() -> None:
     """The client merges custom headers and auth token."""
 
@@ -87,15 +91,17 @@ async def test_async_post_json_merges_headers() -> None:
     request = session.requests.pop()
     assert request["url"] == "https://example.invalid/api"
     assert request["json"] == {"foo": "bar"}
-    assert request["timeout"] == 5
+    assert request["timeout"] == ClientTimeout(total=5)
     assert request["headers"] == {
         "Content-Type": "application/json",
         "X-Test": "1",
         "Authorization": "Bearer token",
     }
 
+    await client.async_post_json({"foo": "baz"})
+    assert session.requests.pop()["headers"] is request["headers"]
+
 
-@pytest.mark.asyncio
 async def test_async_post_json_raises_client_error() -> None:
     """Client errors are wrapped in AIEmbodiedClientError."""
 
@@ -119,3 +125,113 @@ def test_client_config_property() -> None:
     config = AIEmbodiedClientConfig(endpoint="https://example.invalid/api", timeout=7)
     client = AIEmbodiedClient(_StubSession(), config)  # type: ignore[arg-type]
     assert client.config is config
+
+
+async def test_async_post_json_throttles_requests(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Requests beyond the per-minute throttle wait for the bucket to refill."""
+
+    delays: list[float] = []
+
+    async def _fake_sleep(delay: float) -> None:
+        delays.append(delay)
+
+    monkeypatch.setattr("custom_components.aiembodied.api_client.asyncio.sleep", _fake_sleep)
+
+    session = _StubSession()
+    session.set_response(_StubResponse({"ok": True}))
+    client = AIEmbodiedClient(
+        session,  # type: ignore[arg-type]
+        AIEmbodiedClientConfig(endpoint="https://example.invalid/api", throttle=2),
+    )
+
+    await client.async_post_json({}, throttled=True)
+    await client.async_post_json({}, throttled=True)
+    assert delays == []
+
+    await client.async_post_json({}, throttled=True)
+    assert len(delays) == 1
+    assert 0 < delays[0] <= 30
+    assert len(session.requests) == 3
+
+    # Unthrottled requests, such as conversation turns, never wait on the bucket.
+    await client.async_post_json({})
+    assert len(delays) == 1
+    assert len(session.requests) == 4
+
+
+async def test_throttle_rejects_requests_beyond_the_wait_bound(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Concurrent throttled requests queue without a lock, and overflow fails fast."""
+
+    delays: list[float] = []
+
+    async def _fake_sleep(delay: float) -> None:
+        delays.append(delay)
+
+    monkeypatch.setattr("custom_components.aiembodied.api_client.asyncio.sleep", _fake_sleep)
+    monkeypatch.setattr("custom_components.aiembodied.api_client._THROTTLE_MAX_WAIT", 45.0)
+
+    session = _StubSession()
+    session.set_response(_StubResponse({"ok": True}))
+    client = AIEmbodiedClient(
+        session,  # type: ignore[arg-type]
+        AIEmbodiedClientConfig(endpoint="https://example.invalid/api", throttle=2),
+    )
+
+    results = await asyncio.gather(
+        *(client.async_post_json({}, throttled=True) for _ in range(4)),
+        return_exceptions=True,
+    )
+
+    assert results[:3] == [{"ok": True}] * 3
+    assert isinstance(results[3], AIEmbodiedThrottledError)
+    assert len(delays) == 1 and 0 < delays[0] <= 30
+
+
+async def test_async_post_json_serializes_read_only_mappings() -> None:
+    """Read-only mappings in the payload are encoded as JSON objects."""
+
+    session = _StubSession()
+    session.set_response(_StubResponse({"ok": True}))
+    client = AIEmbodiedClient(
+        session,  # type: ignore[arg-type]
+        AIEmbodiedClientConfig(endpoint="https://example.invalid/api"),
+    )
+
+    await client.async_post_json({"routing": MappingProxyType({"mode": "assist"})})
+    assert session.requests.pop()["json"] == {"routing": {"mode": "assist"}}
+
+
+async def test_async_post_json_encodes_datetimes_as_isoformat() -> None:
+    """Aware datetimes are encoded exactly as ``datetime.isoformat`` renders them."""
+
+    session = _StubSession()
+    session.set_response(_StubResponse({"ok": True}))
+    client = AIEmbodiedClient(
+        session,  # type: ignore[arg-type]
+        AIEmbodiedClientConfig(endpoint="https://example.invalid/api"),
+    )
+
+    changed = datetime(2025, 10, 21, 8, 30, 15, 123456, tzinfo=timezone.utc)
+    await client.async_post_json({"last_changed": changed})
+    assert session.requests.pop()["json"] == {"last_changed": changed.isoformat()}
+
+
+async def test_async_post_json_wraps_invalid_json() -> None:
+    """Undecodable response bodies are reported as client errors."""
+
+    class _InvalidResponse(_StubResponse):
+        async def read(self) -> bytes:
+            return b"<html>"
+
+    session = _StubSession()
+    session.set_response(_InvalidResponse({}))
+    client = AIEmbodiedClient(
+        session,  # type: ignore[arg-type]
+        AIEmbodiedClientConfig(endpoint="https://example.invalid/api"),
+    )
+
+    with pytest.raises(AIEmbodiedClientError):
+        await client.async_post_json({})
+
@@ -2,11 +2,10 @@
 
 from __future__ import annotations
 
+import asyncio
 from collections.abc import Awaitable, Callable
 from typing import Any, Mapping
 
-import pytest
-
 from custom_components.aiembodied.autonomy import AutonomyController
 from custom_components.aiembodied.const import OPTIONS_AUTONOMY_PAUSED
 
@@ -38,7 +37,7 @@ class _StubConfigEntries:
         options: Mapping[str, Any] | None = None,
     ) -> None:
         if options is not None:
-            entry.options = dict(options)
+            entry.options = options if type(options) is dict else dict(options)
             self.updated.append(entry.options)
         if entry.update_listener is not None:
             await entry.update_listener(None, entry)
@@ -62,19 +61,36 @@ class _StubHass:
         self.services = _StubServices()
         self.config_entries = _StubConfigEntries()
         self.reloads: list[str] = []
+        self.tasks: list[asyncio.Future[Any]] = []
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return asyncio.get_running_loop()
+
+    def async_create_task(self, coro: Awaitable[Any]) -> asyncio.Future[Any]:
+        task = asyncio.ensure_future(coro)
+        self.tasks.append(task)
+        return task
 
     async def request_reload(self, entry_id: str) -> None:
         self.reloads.append(entry_id)
 
 
-@pytest.mark.asyncio
+async def _async_flush_persist(hass: _StubHass) -> None:
+    """Let the debounced options write fire and complete."""
+
+    for _ in range(5):
+        await asyncio.sleep(0)
+    await asyncio.gather(*hass.tasks)
+
+
 async def test_async_set_paused_updates_options_and_callbacks() -> None:
     """Setting the pause state persists options and notifies listeners."""
 
     hass = _StubHass()
     entry = _StubConfigEntry("entry-1")
 
-    controller = AutonomyController(hass, entry)
+    controller = AutonomyController(hass, entry, persist_delay=0)
     callback_states: list[bool] = []
 
     async def _update_listener(hass_obj: Any, config_entry: Any) -> None:  # noqa: ANN001
@@ -99,12 +115,13 @@ async def test_async_set_paused_updates_options_and_callbacks() -> None:
 
     assert controller.paused is True
     assert callback_states == [True]
+
+    await _async_flush_persist(hass)
     assert hass.reloads == [entry.entry_id]
     assert hass.config_entries.updated[-1][OPTIONS_AUTONOMY_PAUSED] is True
     assert updates == 1
 
 
-@pytest.mark.asyncio
 async def test_record_failure_triggers_notification() -> None:
     """Repeated failures raise a persistent notification."""
 
@@ -114,13 +131,17 @@ async def test_record_failure_triggers_notification() -> None:
 
     await controller.record_failure("event", "first")
     assert hass.services.calls == []
-    assert controller.diagnostics.consecutive_failures == 1
+    snapshot = controller.diagnostics
+    assert snapshot.consecutive_failures == 1
+    assert snapshot.last_failure == "first"
+    assert controller.diagnostics is snapshot
 
     await controller.record_failure("event", "second")
     assert hass.services.calls
     domain, service, data, blocking = hass.services.calls[0]
     assert domain == "persistent_notification"
     assert service == "create"
+    assert type(data) is dict
     assert data["notification_id"].endswith(entry.entry_id)
     assert blocking is False
     assert controller.upstream_available is False
@@ -128,3 +149,116 @@ async def test_record_failure_triggers_notification() -> None:
     controller.record_success()
     assert controller.upstream_available is True
     assert controller.diagnostics.consecutive_failures == 0
+
+
+async def test_listener_can_unsubscribe_during_notification() -> None:
+    """Listeners removing themselves mid-notification do not skip their peers."""
+
+    controller = AutonomyController(_StubHass(), _StubConfigEntry("entry-3"))
+    calls: list[str] = []
+
+    def _first() -> None:
+        calls.append("first")
+        remove_first()
+
+    def _second() -> None:
+        calls.append("second")
+
+    remove_first = controller.async_add_listener(_first)
+    controller.async_add_listener(_second)
+
+    await controller.record_failure("event", "boom")
+    await asyncio.sleep(0)
+    await controller.record_failure("event", "again")
+    await asyncio.sleep(0)
+
+    assert calls == ["first", "second", "second"]
+
+
+async def test_listener_notifications_coalesce_within_a_tick() -> None:
+    """Several changes in one loop iteration produce a single listener pass."""
+
+    controller = AutonomyController(_StubHass(), _StubConfigEntry("entry-6"))
+    notified: list[int] = []
+    controller.async_add_listener(
+        lambda: notified.append(controller.diagnostics.consecutive_failures)
+    )
+
+    await controller.record_failure("event", "one")
+    await controller.record_failure("event", "two")
+    assert notified == []
+
+    await asyncio.sleep(0)
+    assert notified == [2]
+
+
+def test_record_success_is_noop_when_healthy() -> None:
+    """Successes without prior failures leave state untouched and stay silent."""
+
+    controller = AutonomyController(_StubHass(), _StubConfigEntry("entry-4"))
+    notified: list[bool] = []
+    controller.async_add_listener(lambda: notified.append(True))
+
+    controller.record_success()
+
+    assert notified == []
+    assert controller.diagnostics.consecutive_failures == 0
+    assert controller.diagnostics.last_failure is None
+
+
+async def test_pause_callbacks_run_concurrently() -> None:
+    """A failing or slow pause callback does not block the others."""
+
+    controller = AutonomyController(_StubHass(), _StubConfigEntry("entry-5"))
+    started: list[str] = []
+    release = asyncio.Event()
+
+    async def _slow(paused: bool) -> None:  # noqa: ARG001
+        started.append("slow")
+        await release.wait()
+
+    async def _failing(paused: bool) -> None:  # noqa: ARG001
+        started.append("failing")
+        raise RuntimeError("boom")
+
+    async def _fast(paused: bool) -> None:  # noqa: ARG001
+        started.append("fast")
+        release.set()
+
+    controller.add_pause_callbacks([_slow, _failing, _fast])
+
+    await controller.async_set_paused(True, persist=False)
+
+    assert started == ["slow", "failing", "fast"]
+    assert controller.paused is True
+
+
+async def test_rapid_toggles_persist_once() -> None:
+    """Only the final pause state of a burst of toggles is written to options."""
+
+    hass = _StubHass()
+    entry = _StubConfigEntry("entry-6")
+    controller = AutonomyController(hass, entry, persist_delay=0)
+
+    await controller.async_set_paused(True)
+    await controller.async_set_paused(False)
+    await controller.async_set_paused(True)
+    await _async_flush_persist(hass)
+
+    assert hass.config_entries.updated == [{OPTIONS_AUTONOMY_PAUSED: True}]
+
+
+async def test_shutdown_flushes_pending_persist() -> None:
+    """Unloading before the debounce fires writes the pending state exactly once."""
+
+    hass = _StubHass()
+    entry = _StubConfigEntry("entry-7")
+    controller = AutonomyController(hass, entry, persist_delay=0)
+
+    await controller.async_set_paused(True)
+    await controller.async_shutdown()
+    assert len(hass.config_entries.updated) == 1
+    assert hass.config_entries.updated[0][OPTIONS_AUTONOMY_PAUSED] is True
+
+    await _async_flush_persist(hass)
+    assert len(hass.config_entries.updated) == 1
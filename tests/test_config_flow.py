@@ -6,17 +6,21 @@ from dataclasses import dataclass, field
 
 import pytest
 
+from custom_components.aiembodied import config_flow
 from custom_components.aiembodied.config_flow import (
     AIEmbodiedConfigFlow,
     AIEmbodiedOptionsFlowHandler,
     _normalize_config_data,
     _parse_mapping,
+    _parse_string_collection,
 )
 from custom_components.aiembodied.const import (
     CONF_AUTH_TOKEN,
+    CONF_BATCH_ENVELOPE,
     CONF_BATCHING,
     CONF_ENDPOINT,
     CONF_EXPOSURE,
+    CONF_FINE_GRAINED_AUDIT,
     CONF_HEADERS,
     CONF_ROUTING,
     CONF_THROTTLE,
@@ -26,10 +30,10 @@ from custom_components.aiembodied.const import (
     OPTIONS_DEBUG,
     OPTIONS_MAX_EVENTS_PER_MINUTE,
 )
-from homeassistant.data_entry_flow import FlowResultType
+from homeassistant.data_entry_flow import AbortFlow, FlowResultType
 
 
-@dataclass
+@dataclass(slots=True)
 class _DummyConfigEntry:
     """Minimal representation of a Home Assistant config entry."""
 
@@ -85,7 +89,6 @@ class _DummyHass:
         self.config_entries = _DummyConfigEntries()
 
 
-@pytest.mark.asyncio
 async def test_user_flow_creates_entry() -> None:
     """A successful user flow normalizes values and stores them in the entry."""
 
@@ -120,6 +123,8 @@ async def test_user_flow_creates_entry() -> None:
     assert data[CONF_EXPOSURE] == ["light.kitchen", "sensor.office"]
     assert data[CONF_THROTTLE] == 45
     assert data[CONF_BATCHING] is False
+    assert data[CONF_BATCH_ENVELOPE] is False
+    assert data[CONF_FINE_GRAINED_AUDIT] is True
     assert data[CONF_ROUTING] == {"pipeline": "assist"}
 
     hass.config_entries.add(_DummyConfigEntry(unique_id="https://example.invalid/api", data=data))
@@ -128,42 +133,55 @@ async def test_user_flow_creates_entry() -> None:
     flow_duplicate.hass = hass  # type: ignore[assignment]
     flow_duplicate.context = {}
     flow_duplicate.handler = DOMAIN
-    duplicate = await flow_duplicate.async_step_user(
-        {
-            CONF_ENDPOINT: "https://example.invalid/api",
-            CONF_AUTH_TOKEN: "token-123",
-            CONF_HEADERS: "X-Test: 1",
-            CONF_EXPOSURE: "light.kitchen",
-            CONF_THROTTLE: 60,
-            CONF_BATCHING: True,
-            CONF_ROUTING: "",
-        }
-    )
-    assert duplicate["type"] == FlowResultType.ABORT
-    assert duplicate["reason"] == "already_configured"
+    with pytest.raises(AbortFlow) as duplicate:
+        await flow_duplicate.async_step_user(
+            {
+                CONF_ENDPOINT: "https://example.invalid/api",
+                CONF_AUTH_TOKEN: "token-123",
+                CONF_HEADERS: "X-Test: 1",
+                CONF_EXPOSURE: "light.kitchen",
+                CONF_THROTTLE: 60,
+                CONF_BATCHING: True,
+                CONF_ROUTING: "",
+            }
+        )
+    assert duplicate.value.reason == "already_configured"
+
+
+async def test_user_flow_retry_reparses_only_changed_fields(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Resubmitting after an error re-parses only the fields that changed."""
+
+    calls: list[object] = []
+    original = config_flow._parse_mapping
+
+    def _counting_parse(value: object) -> dict[str, str]:
+        calls.append(value)
+        return original(value)
+
+    monkeypatch.setattr(config_flow, "_parse_mapping", _counting_parse)
 
-
-@pytest.mark.asyncio
-async def test_user_flow_reports_invalid_headers() -> None:
-    """Invalid header strings surface as inline form errors."""
-
-    hass = _DummyHass()
     flow = AIEmbodiedConfigFlow()
-    flow.hass = hass  # type: ignore[assignment]
-
-    response = await flow.async_step_user(
-        {
-            CONF_ENDPOINT: "https://example.invalid/api",
-            CONF_HEADERS: "bad-header",
-            CONF_THROTTLE: 60,
-        }
-    )
+    flow.hass = _DummyHass()  # type: ignore[assignment]
+    flow.handler = DOMAIN
 
-    assert response["type"] == FlowResultType.FORM
+    user_input = {
+        CONF_ENDPOINT: "https://example.invalid/api",
+        CONF_HEADERS: "bad-header",
+        CONF_ROUTING: "pipeline: assist",
+        CONF_THROTTLE: 60,
+    }
+    response = await flow.async_step_user(user_input)
     assert response["errors"][CONF_HEADERS] == "invalid_headers"
 
+    result = await flow.async_step_user({**user_input, CONF_HEADERS: "X-Test: 1"})
+
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert result["data"][CONF_ROUTING] == {"pipeline": "assist"}
+    assert calls == ["bad-header", "X-Test: 1", "pipeline: assist"]
+
 
-@pytest.mark.asyncio
 async def test_options_flow_updates_values() -> None:
     """Options flow accepts positive integers and toggles."""
 
@@ -190,7 +208,6 @@ async def test_options_flow_updates_values() -> None:
     assert options[OPTIONS_AUTONOMY_PAUSED] is True
 
 
-@pytest.mark.asyncio
 async def test_options_flow_validates_positive_ints() -> None:
     """Invalid numeric inputs return field-specific errors."""
 
@@ -211,38 +228,44 @@ async def test_options_flow_validates_positive_ints() -> None:
     assert response["errors"][OPTIONS_BURST_SIZE] == "invalid_positive_int"
 
 
-@pytest.mark.asyncio
-async def test_user_flow_requires_endpoint() -> None:
-    """Missing endpoints surface as required field errors."""
-
-    hass = _DummyHass()
-    flow = AIEmbodiedConfigFlow()
-    flow.hass = hass  # type: ignore[assignment]
-
-    response = await flow.async_step_user({CONF_THROTTLE: 60})
-    assert response["type"] == FlowResultType.FORM
-    assert response["errors"][CONF_ENDPOINT] == "required"
-
-
-@pytest.mark.asyncio
-async def test_user_flow_validates_throttle_values() -> None:
-    """Throttle values must be positive integers."""
+@pytest.mark.parametrize(
+    ("user_input", "field", "error"),
+    [
+        (
+            {
+                CONF_ENDPOINT: "https://example.invalid/api",
+                CONF_HEADERS: "bad-header",
+                CONF_THROTTLE: 60,
+            },
+            CONF_HEADERS,
+            "invalid_headers",
+        ),
+        ({CONF_THROTTLE: 60}, CONF_ENDPOINT, "required"),
+        (
+            {CONF_ENDPOINT: "https://example.invalid", CONF_THROTTLE: "abc"},
+            CONF_THROTTLE,
+            "invalid_throttle",
+        ),
+        (
+            {CONF_ENDPOINT: "https://example.invalid", CONF_THROTTLE: 0},
+            CONF_THROTTLE,
+            "invalid_throttle",
+        ),
+    ],
+    ids=["invalid-headers", "missing-endpoint", "non-numeric-throttle", "zero-throttle"],
+)
+async def test_user_flow_reports_field_errors(
+    user_input: dict[str, object], field: str, error: str
+) -> None:
+    """Invalid user input re-renders the form with a field-specific error."""
 
-    hass = _DummyHass()
     flow = AIEmbodiedConfigFlow()
-    flow.hass = hass  # type: ignore[assignment]
+    flow.hass = _DummyHass()  # type: ignore[assignment]
 
-    invalid_type = await flow.async_step_user(
-        {CONF_ENDPOINT: "https://example.invalid", CONF_THROTTLE: "abc"}
-    )
-    assert invalid_type["type"] == FlowResultType.FORM
-    assert invalid_type["errors"][CONF_THROTTLE] == "invalid_throttle"
+    response = await flow.async_step_user(user_input)
 
-    non_positive = await flow.async_step_user(
-        {CONF_ENDPOINT: "https://example.invalid", CONF_THROTTLE: 0}
-    )
-    assert non_positive["type"] == FlowResultType.FORM
-    assert non_positive["errors"][CONF_THROTTLE] == "invalid_throttle"
+    assert response["type"] == FlowResultType.FORM
+    assert response["errors"] == {field: error}
 
 
 def test_parse_mapping_variants() -> None:
@@ -250,6 +273,7 @@ def test_parse_mapping_variants() -> None:
 
     assert _parse_mapping({"A": 1}) == {"A": "1"}
     assert _parse_mapping("foo: 1\n\nbar: 2") == {"foo": "1", "bar": "2"}
+    assert _parse_mapping("foo: a:b\r\nbar:2") == {"foo": "a:b", "bar": "2"}
 
     with pytest.raises(ValueError):
         _parse_mapping(": missing")
@@ -258,6 +282,18 @@ def test_parse_mapping_variants() -> None:
         _parse_mapping('["not", "a", "mapping"]')
 
 
+def test_parse_string_collection_splits_on_commas_and_newlines() -> None:
+    """Collections accept comma or newline separators and drop blanks."""
+
+    assert _parse_string_collection("light.a, light.b\r\n\n,sensor.*") == [
+        "light.a",
+        "light.b",
+        "sensor.*",
+    ]
+    assert _parse_string_collection([" light.a ", "", 3]) == ["light.a", "3"]
+    assert _parse_string_collection(None) == []
+
+
 def test_normalize_config_data_coerces_values() -> None:
     """Normalization coerces optional fields and parses collections."""
 
@@ -2,15 +2,19 @@
 
 from __future__ import annotations
 
+import asyncio
+import dataclasses
+from types import SimpleNamespace
 from typing import Any
 
 import pytest
 
 import custom_components.aiembodied as integration
+import voluptuous as vol
 from custom_components.aiembodied.api_client import AIEmbodiedClientError
-from custom_components.aiembodied.const import DATA_RUNTIME, DOMAIN
+from custom_components.aiembodied.const import DOMAIN
 from homeassistant.components import conversation
-from homeassistant.core import Context, HomeAssistant
+from homeassistant.core import Context
 from homeassistant.exceptions import HomeAssistantError
 
 
@@ -19,8 +23,8 @@ class _DummyConfigEntries:
 
     def __init__(self, hass: "_DummyHass") -> None:
         self._hass = hass
-        self.forwarded: list[tuple[Any, list[Any]]] = []
-        self.unloaded: list[tuple[Any, list[Any]]] = []
+        self.forwarded: list[tuple[Any, Any]] = []
+        self.unloaded: list[tuple[Any, Any]] = []
 
     async def async_reload(self, entry_id: str) -> None:
         await self._hass._async_reload(entry_id)
@@ -28,12 +32,12 @@ class _DummyConfigEntries:
     async def async_forward_entry_setups(
         self, entry: Any, platforms: Any
     ) -> None:  # noqa: ANN001
-        self.forwarded.append((entry, list(platforms)))
+        self.forwarded.append((entry, platforms))
 
     async def async_unload_platforms(
         self, entry: Any, platforms: Any
     ) -> bool:  # noqa: ANN001
-        self.unloaded.append((entry, list(platforms)))
+        self.unloaded.append((entry, platforms))
         return True
 
     async def async_update_entry(
@@ -49,15 +53,19 @@ class _DummyConfigEntries:
             await entry._update_listener(None, entry)
 
 
-class _DummyHass(HomeAssistant):
-    """Simple Home Assistant substitute for tests."""
+class _DummyHass:
+    """Simple Home Assistant substitute exposing only what the integration touches."""
 
     def __init__(self) -> None:
-        super().__init__()
+        self.data: dict[str, dict[str, Any]] = {}
         self.config_entries = _DummyConfigEntries(self)
         self.reloads: list[str] = []
         self.services = _DummyServices()
 
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return asyncio.get_running_loop()
+
     async def _async_reload(self, entry_id: str) -> None:
         self.reloads.append(entry_id)
 
@@ -66,7 +74,7 @@ class _DummyServices:
     """Minimal service registry for exercising helper services."""
 
     def __init__(self) -> None:
-        self.handlers: dict[tuple[str, str], tuple[Any, bool]] = {}
+        self.handlers: dict[tuple[str, str], tuple[Any, bool, Any]] = {}
 
     def has_service(self, domain: str, service: str) -> bool:
         return (domain, service) in self.handlers
@@ -80,7 +88,7 @@ class _DummyServices:
         supports_response: bool = False,
         schema: Any | None = None,
     ) -> None:
-        self.handlers[(domain, service)] = (handler, supports_response)
+        self.handlers[(domain, service)] = (handler, supports_response, schema)
 
     async def async_call(
         self,
@@ -91,20 +99,15 @@ class _DummyServices:
         blocking: bool = False,
         return_response: bool = False,
     ) -> Any:
-        handler, supports_response = self.handlers[(domain, service)]
-        result = await handler(_SimpleServiceCall(data))
+        handler, supports_response, schema = self.handlers[(domain, service)]
+        if schema is not None:
+            data = schema(data)
+        result = await handler(SimpleNamespace(data=data))
         if return_response and supports_response:
             return result
         return None
 
 
-class _SimpleServiceCall:
-    """Service call shim matching the attributes used by the handler."""
-
-    def __init__(self, data: dict[str, Any]) -> None:
-        self.data = data
-
-
 class _MockConfigEntry:
     """Config entry stub providing the hooks used by the integration."""
 
@@ -146,24 +149,20 @@ class _FailingClient(_StubClient):
         raise AIEmbodiedClientError("boom")
 
 
+_DEFAULT_CONFIG = integration.IntegrationConfig(
+    endpoint="https://example.invalid/api",
+    auth_token=None,
+    headers={},
+)
+
+
 def _make_config(**overrides: Any) -> integration.IntegrationConfig:
     """Helper to construct integration configs for conversation tests."""
 
-    base = dict(
-        endpoint="https://example.invalid/api",
-        auth_token=None,
-        headers={},
-        exposure=[],
-        throttle=None,
-        batching=False,
-        routing={},
-    )
-    base.update(overrides)
-    return integration.IntegrationConfig(**base)
+    return dataclasses.replace(_DEFAULT_CONFIG, **overrides) if overrides else _DEFAULT_CONFIG
 
 
-@pytest.mark.asyncio
-async def test_conversation_agent_handles_requests(monkeypatch: pytest.MonkeyPatch) -> None:
+async def test_conversation_agent_handles_requests() -> None:
     """The conversation agent sends structured payloads and returns responses."""
 
     hass = _DummyHass()
@@ -181,13 +180,11 @@ async def test_conversation_agent_handles_requests(monkeypatch: pytest.MonkeyPat
     )
 
     client = _StubClient({"reply": "Hi there!", "conversation_id": "remote-123"})
-    monkeypatch.setattr(integration, "_create_client", lambda hass, config: client)
 
     await integration.async_setup(hass, {})
-    await integration.async_setup_entry(hass, entry)
+    await integration.async_setup_entry(hass, entry, client_factory=lambda session, config: client)
 
-    runtime_wrapper = hass.data[DOMAIN][entry.entry_id]
-    runtime = runtime_wrapper[DATA_RUNTIME]
+    runtime = hass.data[DOMAIN][entry.entry_id]
     agent = conversation.async_get_agent(hass, entry.entry_id)
 
     assert agent is runtime.agent
@@ -214,7 +211,7 @@ async def test_conversation_agent_handles_requests(monkeypatch: pytest.MonkeyPat
         "device_id": "device-1",
     }
     assert payload["config"] == {
-        "exposure": ["light.kitchen"],
+        "exposure": ("light.kitchen",),
         "batching": True,
         "throttle": 30,
         "routing": {"pipeline": "assist"},
@@ -225,28 +222,23 @@ async def test_conversation_agent_handles_requests(monkeypatch: pytest.MonkeyPat
     assert conversation.async_get_agent(hass, entry.entry_id) is None
 
 
-@pytest.mark.asyncio
-async def test_conversation_agent_wraps_client_errors(monkeypatch: pytest.MonkeyPatch) -> None:
+async def test_conversation_agent_wraps_client_errors() -> None:
     """Client errors are surfaced as conversation errors."""
 
     hass = _DummyHass()
     entry = _MockConfigEntry("entry-2", {"endpoint": "https://example.invalid/api"})
 
     client = _FailingClient({})
-    monkeypatch.setattr(integration, "_create_client", lambda hass, config: client)
 
     await integration.async_setup(hass, {})
-    await integration.async_setup_entry(hass, entry)
+    await integration.async_setup_entry(hass, entry, client_factory=lambda session, config: client)
 
     agent = conversation.async_get_agent(hass, entry.entry_id)
     with pytest.raises(conversation.ConversationError):
         await agent.async_handle(conversation.ConversationInput(text="Hello"))
 
 
-@pytest.mark.asyncio
-async def test_send_conversation_turn_service_returns_agent_reply(
-    monkeypatch: pytest.MonkeyPatch,
-) -> None:
+async def test_send_conversation_turn_service_returns_agent_reply() -> None:
     """Service helper forwards requests to the configured conversation agent."""
 
     hass = _DummyHass()
@@ -259,10 +251,9 @@ async def test_send_conversation_turn_service_returns_agent_reply(
     )
 
     client = _StubClient({"text": "Lights set", "conversation_id": "conv-789"})
-    monkeypatch.setattr(integration, "_create_client", lambda hass, config: client)
 
     await integration.async_setup(hass, {})
-    await integration.async_setup_entry(hass, entry)
+    await integration.async_setup_entry(hass, entry, client_factory=lambda session, config: client)
 
     response = await hass.services.async_call(
         integration.DOMAIN,
@@ -296,18 +287,20 @@ async def test_send_conversation_turn_service_returns_agent_reply(
         "language": "en",
         "device_id": "device-9",
     }
-    assert payload["config"] == {"exposure": ["light.living_room"], "batching": False}
+    assert payload["config"] == {"exposure": ("light.living_room",), "batching": False}
     assert payload["context"] == {"id": "ctx-1", "user_id": "user-2"}
 
 
-@pytest.mark.asyncio
-async def test_send_conversation_turn_service_requires_active_entry(
-    monkeypatch: pytest.MonkeyPatch,
-) -> None:
-    """Calling the helper without a configured entry raises an error."""
+async def test_send_conversation_turn_service_requires_active_entry() -> None:
+    """Calling the helper for an entry that is not loaded raises an error."""
 
     hass = _DummyHass()
+    entry = _MockConfigEntry("entry-4", {"endpoint": "https://example.invalid/api"})
+
     await integration.async_setup(hass, {})
+    await integration.async_setup_entry(
+        hass, entry, client_factory=lambda session, config: _StubClient({})
+    )
 
     with pytest.raises(HomeAssistantError):
         await hass.services.async_call(
@@ -317,10 +310,58 @@ async def test_send_conversation_turn_service_requires_active_entry(
             blocking=True,
             return_response=True,
         )
+
+
+async def test_send_conversation_turn_service_accepts_null_optionals() -> None:
+    """Explicit nulls for optional fields pass the service schema and are ignored."""
+
+    hass = _DummyHass()
+    entry = _MockConfigEntry("entry-5", {"endpoint": "https://example.invalid/api"})
+    client = _StubClient({"reply": "ok"})
+
+    await integration.async_setup(hass, {})
+    await integration.async_setup_entry(hass, entry, client_factory=lambda session, config: client)
+
+    response = await hass.services.async_call(
+        integration.DOMAIN,
+        integration.SERVICE_SEND_CONVERSATION_TURN,
+        {
+            "entry_id": entry.entry_id,
+            "text": "hi",
+            "conversation_id": None,
+            "language": None,
+            "device_id": None,
+            "context_id": None,
+        },
+        blocking=True,
+        return_response=True,
+    )
+
+    assert response["response"]["text"] == "ok"
+    payload = client.requests.pop()
+    assert payload["input"]["conversation_id"] is None
+    assert "context" not in payload
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        pytest.param({"entry_id": "entry", "text": ""}, id="empty_text"),
+        pytest.param({"entry_id": "entry", "text": "hi", "language": 5}, id="non_string"),
+        pytest.param({"entry_id": "entry", "text": "hi", "extra": "x"}, id="extra_key"),
+    ],
+)
+def test_send_conversation_turn_schema_rejects_invalid_data(data: dict[str, Any]) -> None:
+    """The registered schema rejects malformed service data."""
+
+    with pytest.raises(vol.Invalid):
+        integration.SERVICE_SEND_CONVERSATION_TURN_SCHEMA(data)
+
+
 def test_conversation_agent_metadata_and_text_coercion() -> None:
     """Metadata properties and text coercion helpers are exercised."""
 
-    config = _make_config(exposure=["light.kitchen"], routing={"pipeline": "assist"})
+    config = _make_config(exposure=("light.kitchen",), routing={"pipeline": "assist"})
     agent = integration.AIEmbodiedConversationAgent(_StubClient({"reply": "ok"}), config)
 
     assert agent.supported_languages == {"*"}
@@ -330,7 +371,6 @@ def test_conversation_agent_metadata_and_text_coercion() -> None:
     assert agent._coerce_text({"text": "  hi  "}) == "hi"
 
 
-@pytest.mark.asyncio
 async def test_conversation_agent_errors_when_text_missing() -> None:
     """Missing textual responses raise conversation errors."""
 
@@ -341,7 +381,6 @@ async def test_conversation_agent_errors_when_text_missing() -> None:
         await agent.async_handle(conversation.ConversationInput(text="Hello"))
 
 
-@pytest.mark.asyncio
 async def test_conversation_agent_conversation_id_fallback() -> None:
     """Conversation id falls back to the local value when not provided."""
 
@@ -3,15 +3,30 @@
 from __future__ import annotations
 
 import asyncio
-from dataclasses import dataclass
+import logging
+from dataclasses import dataclass, replace
+from types import SimpleNamespace
 from typing import Any, Coroutine
 
 import pytest
 
 from custom_components.aiembodied import IntegrationConfig
-from custom_components.aiembodied.api_client import AIEmbodiedClientError
-from custom_components.aiembodied.exposure import ExposureController
+from custom_components.aiembodied.api_client import (
+    AIEmbodiedClientError,
+    AIEmbodiedThrottledError,
+)
+from custom_components.aiembodied.const import EXPOSURE_MAX_IN_FLIGHT
+from custom_components.aiembodied.exposure import ExposureController, _ExposureFilters
 from homeassistant.core import Context, State
+from homeassistant.helpers.event import TrackStates
+
+_BASE_CONFIG = IntegrationConfig(
+    endpoint="https://example.invalid/api",
+    auth_token=None,
+    headers={},
+)
+_KITCHEN_CONFIG = replace(_BASE_CONFIG, exposure=("light.kitchen",))
+_LIGHTS_CONFIG = replace(_BASE_CONFIG, exposure=("light.*",))
 
 
 @dataclass
@@ -40,9 +55,10 @@ class _DummyBus:
 
 
 class _RecorderAutonomy:
-    def __init__(self) -> None:
+    def __init__(self, paused: bool = False) -> None:
         self.failures: list[tuple[str, str]] = []
         self.successes = 0
+        self.paused = paused
 
     async def record_failure(self, source: str, message: str) -> None:
         self.failures.append((source, message))
@@ -63,22 +79,15 @@ class _DummyHass:
         return task
 
     async def async_drain(self) -> None:
-        for task in list(self._tasks):
-            await task
-        self._tasks = [task for task in self._tasks if not task.done()]
+        tasks, self._tasks = self._tasks, []
+        await asyncio.gather(*tasks)
 
 
-@pytest.mark.asyncio
 async def test_controller_forwards_matching_state(monkeypatch: pytest.MonkeyPatch) -> None:
     """State changes for exposed entities are forwarded to the client."""
 
     hass = _DummyHass()
-    config = IntegrationConfig(
-        endpoint="https://example.invalid/api",
-        auth_token=None,
-        headers={},
-        exposure=["light.kitchen"],
-    )
+    config = _KITCHEN_CONFIG
 
     callbacks: list[object] = []
 
@@ -93,10 +102,14 @@ async def test_controller_forwards_matching_state(monkeypatch: pytest.MonkeyPatc
     )
 
     client_calls: list[dict[str, object]] = []
+    throttled_flags: list[bool] = []
 
     class _DummyClient:
-        async def async_post_json(self, payload: dict[str, object]) -> None:
+        async def async_post_json(
+            self, payload: dict[str, object], *, throttled: bool = False
+        ) -> None:
             client_calls.append(payload)
+            throttled_flags.append(throttled)
 
     autonomy = _RecorderAutonomy()
     controller = ExposureController(
@@ -116,68 +129,63 @@ async def test_controller_forwards_matching_state(monkeypatch: pytest.MonkeyPatc
     await hass.async_drain()
 
     assert client_calls and client_calls[0]["event"] == "state_changed"
+    assert throttled_flags == [True]
     data = client_calls[0]["data"]
     assert data["entity_id"] == "light.kitchen"
     assert data["context"]["id"] == "ctx-1"
+    assert data["state"]["new"]["attributes"] is event.new_state.attributes
     assert hass.bus.events[0][0] == "aiembodied.update_forwarded"
     assert hass.bus.events[0][1]["success"] is True
     assert autonomy.successes == 1
     assert not autonomy.failures
 
 
-@pytest.mark.asyncio
-async def test_controller_skips_unexposed_entities(monkeypatch: pytest.MonkeyPatch) -> None:
-    """Entities outside the exposure list are ignored."""
+async def test_controller_tracks_only_exposed_entities(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Listeners are registered for the exposed entities and domains, not MATCH_ALL."""
 
     hass = _DummyHass()
-    config = IntegrationConfig(
-        endpoint="https://example.invalid/api",
-        auth_token=None,
-        headers={},
-        exposure=["sensor.*"],
-    )
+    config = replace(_BASE_CONFIG, exposure=("sensor.*", "light.kitchen"))
 
-    monkeypatch.setattr(
-        "custom_components.aiembodied.exposure.async_track_state_change_event",
-        lambda *args, **kwargs: (lambda: None),
-    )
+    tracked: list[TrackStates] = []
+    removed: list[bool] = []
 
-    class _DummyClient:
-        def __init__(self) -> None:
-            self.calls: list[dict[str, object]] = []
+    class _Tracker:
+        def async_remove(self) -> None:
+            removed.append(True)
 
-        async def async_post_json(self, payload: dict[str, object]) -> None:
-            self.calls.append(payload)
+    def _fake_track_filtered(hass_obj, track_states, action):  # noqa: ANN001
+        assert hass_obj is hass
+        tracked.append(track_states)
+        return _Tracker()
 
-    client = _DummyClient()
-    controller = ExposureController(hass, client, config, entry_id="entry-2")
-    await controller.async_setup()
+    def _unexpected_entity_listener(*args: object, **kwargs: object) -> None:
+        raise AssertionError("Domain filters should use the filtered tracker")
 
-    event = _FakeEvent(
-        entity_id="light.kitchen",
-        old_state=State("light.kitchen", "off", {}),
-        new_state=State("light.kitchen", "on", {}),
-        context=None,
+    monkeypatch.setattr(
+        "custom_components.aiembodied.exposure.async_track_state_change_filtered",
+        _fake_track_filtered,
+    )
+    monkeypatch.setattr(
+        "custom_components.aiembodied.exposure.async_track_state_change_event",
+        _unexpected_entity_listener,
     )
 
-    controller._handle_state_change(event)
-    await hass.async_drain()
+    controller = ExposureController(hass, object(), config, entry_id="entry-2")
+    await controller.async_setup()
 
-    assert not client.calls
-    assert not hass.bus.events
+    assert tracked == [TrackStates(False, {"light.kitchen"}, {"sensor"})]
+
+    await controller.async_set_paused(True)
+    assert removed == [True]
+    await controller.async_set_paused(False)
+    assert len(tracked) == 2
 
 
-@pytest.mark.asyncio
 async def test_controller_records_failures(monkeypatch: pytest.MonkeyPatch) -> None:
     """Errors raised by the client are captured in the audit event."""
 
     hass = _DummyHass()
-    config = IntegrationConfig(
-        endpoint="https://example.invalid/api",
-        auth_token=None,
-        headers={},
-        exposure=["light.*"],
-    )
+    config = _LIGHTS_CONFIG
 
     monkeypatch.setattr(
         "custom_components.aiembodied.exposure.async_track_state_change_event",
@@ -185,7 +193,9 @@ async def test_controller_records_failures(monkeypatch: pytest.MonkeyPatch) -> N
     )
 
     class _FailingClient:
-        async def async_post_json(self, payload: dict[str, object]) -> None:
+        async def async_post_json(
+            self, payload: dict[str, object], *, throttled: bool = False
+        ) -> None:
             raise AIEmbodiedClientError("failure")
 
     autonomy = _RecorderAutonomy()
@@ -212,17 +222,53 @@ async def test_controller_records_failures(monkeypatch: pytest.MonkeyPatch) -> N
     assert autonomy.failures
 
 
-@pytest.mark.asyncio
+async def test_controller_counts_throttled_updates_as_drops(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Local rate-limit rejections are dropped without marking upstream unhealthy."""
+
+    hass = _DummyHass()
+    monkeypatch.setattr(
+        "custom_components.aiembodied.exposure.async_track_state_change_event",
+        lambda *args, **kwargs: (lambda: None),
+    )
+
+    class _ThrottledClient:
+        async def async_post_json(
+            self, payload: dict[str, object], *, throttled: bool = False
+        ) -> None:
+            raise AIEmbodiedThrottledError("throttled")
+
+    autonomy = _RecorderAutonomy()
+    controller = ExposureController(
+        hass, _ThrottledClient(), _LIGHTS_CONFIG, entry_id="entry-throttled", autonomy=autonomy
+    )
+    await controller.async_setup()
+
+    controller._handle_state_change(
+        _FakeEvent(
+            entity_id="light.desk",
+            old_state=State("light.desk", "off", {}),
+            new_state=State("light.desk", "on", {}),
+            context=None,
+        )
+    )
+    await hass.async_drain()
+
+    assert autonomy.failures == []
+    assert autonomy.successes == 0
+    assert controller._dropped == 1
+    assert controller._in_flight == 0
+    assert hass.bus.events == [
+        ("aiembodied.updates_dropped", {"entry_id": "entry-throttled", "dropped": 1})
+    ]
+
+
 async def test_controller_pause_stops_forwarding(monkeypatch: pytest.MonkeyPatch) -> None:
     """Pausing the controller prevents updates from being sent."""
 
     hass = _DummyHass()
-    config = IntegrationConfig(
-        endpoint="https://example.invalid/api",
-        auth_token=None,
-        headers={},
-        exposure=["light.kitchen"],
-    )
+    config = _KITCHEN_CONFIG
 
     monkeypatch.setattr(
         "custom_components.aiembodied.exposure.async_track_state_change_event",
@@ -233,7 +279,9 @@ async def test_controller_pause_stops_forwarding(monkeypatch: pytest.MonkeyPatch
         def __init__(self) -> None:
             self.calls: list[dict[str, object]] = []
 
-        async def async_post_json(self, payload: dict[str, object]) -> None:
+        async def async_post_json(
+            self, payload: dict[str, object], *, throttled: bool = False
+        ) -> None:
             self.calls.append(payload)
 
     autonomy = _RecorderAutonomy()
@@ -260,3 +308,321 @@ async def test_controller_pause_stops_forwarding(monkeypatch: pytest.MonkeyPatch
 
     assert not client.calls
     assert not hass.bus.events
+
+
+async def test_controller_keeps_per_event_requests_by_default() -> None:
+    """Entries that never opted into the batch envelope keep one request per update."""
+
+    hass = _DummyHass()
+    config = replace(_BASE_CONFIG, exposure=("light.*",), batching=True)
+    calls: list[dict[str, Any]] = []
+
+    class _RecorderClient:
+        async def async_post_json(
+            self, payload: dict[str, Any], *, throttled: bool = False
+        ) -> None:
+            calls.append(payload)
+
+    controller = ExposureController(hass, _RecorderClient(), config, entry_id="entry-default")
+    await controller.async_setup()
+
+    for entity_id in ("light.desk", "light.hall"):
+        controller._handle_state_change(
+            _FakeEvent(
+                entity_id=entity_id,
+                old_state=State(entity_id, "off", {}),
+                new_state=State(entity_id, "on", {}),
+                context=None,
+            )
+        )
+    await hass.async_drain()
+
+    assert [call["event"] for call in calls] == ["state_changed", "state_changed"]
+    assert all(call.get("type") != "batch" for call in calls)
+
+
+@pytest.mark.parametrize("fine_grained_audit", [True, False])
+async def test_controller_batches_bursts_when_enabled(
+    monkeypatch: pytest.MonkeyPatch, fine_grained_audit: bool
+) -> None:
+    """With batching enabled a burst of updates is sent and audited as one request."""
+
+    hass = _DummyHass()
+    config = replace(
+        _BASE_CONFIG,
+        exposure=("light.*",),
+        batch_envelope=True,
+        fine_grained_audit=fine_grained_audit,
+    )
+    monkeypatch.setattr("custom_components.aiembodied.exposure.EXPOSURE_BATCH_DELAY", 0)
+
+    class _RecorderClient:
+        def __init__(self) -> None:
+            self.calls: list[dict[str, Any]] = []
+
+        async def async_post_json(
+            self, payload: dict[str, Any], *, throttled: bool = False
+        ) -> None:
+            self.calls.append(payload)
+
+    client = _RecorderClient()
+    controller = ExposureController(hass, client, config, entry_id="entry-batch")
+    await controller.async_setup()
+
+    for entity_id in ("light.desk", "light.hall"):
+        controller._handle_state_change(
+            _FakeEvent(
+                entity_id=entity_id,
+                old_state=State(entity_id, "off", {}),
+                new_state=State(entity_id, "on", {}),
+                context=None,
+            )
+        )
+    assert not client.calls
+
+    await asyncio.sleep(0.01)
+    await hass.async_drain()
+
+    assert len(client.calls) == 1
+    batch = client.calls[0]
+    assert batch["type"] == "batch"
+    assert [event["data"]["entity_id"] for event in batch["events"]] == [
+        "light.desk",
+        "light.hall",
+    ]
+    assert hass.bus.events[0] == (
+        "aiembodied.updates_forwarded",
+        {
+            "entry_id": "entry-batch",
+            "success": True,
+            "results": [
+                {"entity_id": "light.desk", "domain": "light"},
+                {"entity_id": "light.hall", "domain": "light"},
+            ],
+        },
+    )
+    per_entity = [
+        payload["entity_id"]
+        for event_type, payload in hass.bus.events[1:]
+        if event_type == "aiembodied.update_forwarded"
+    ]
+    assert per_entity == (["light.desk", "light.hall"] if fine_grained_audit else [])
+    assert len(hass.bus.events) == 1 + len(per_entity)
+
+
+async def test_controller_caches_areas_until_registry_changes(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Area lookups are cached per entity and invalidated by registry updates."""
+
+    hass = _DummyHass()
+    listeners: dict[str, Any] = {}
+
+    def _async_listen(event_type: str, listener: Any) -> Any:
+        listeners[event_type] = listener
+        return lambda: listeners.pop(event_type)
+
+    hass.bus.async_listen = _async_listen  # type: ignore[attr-defined]
+
+    lookups: list[str] = []
+    areas = {"kitchen": SimpleNamespace(id="kitchen", name="Kitchen")}
+
+    def _entity_entry(entity_id: str) -> SimpleNamespace:
+        lookups.append(entity_id)
+        return SimpleNamespace(area_id="kitchen")
+
+    entity_registry = SimpleNamespace(async_get=_entity_entry)
+    area_registry = SimpleNamespace(async_get=areas.get)
+    monkeypatch.setattr(
+        "custom_components.aiembodied.exposure.er",
+        SimpleNamespace(
+            EVENT_ENTITY_REGISTRY_UPDATED="entity_registry_updated",
+            async_get=lambda hass_obj: entity_registry,
+        ),
+    )
+    monkeypatch.setattr(
+        "custom_components.aiembodied.exposure.ar",
+        SimpleNamespace(
+            EVENT_AREA_REGISTRY_UPDATED="area_registry_updated",
+            async_get=lambda hass_obj: area_registry,
+        ),
+    )
+
+    config = _KITCHEN_CONFIG
+    controller = ExposureController(hass, object(), config, entry_id="entry-area")
+    await controller.async_setup()
+
+    assert controller._resolve_area("light.kitchen") == "Kitchen"
+    assert controller._resolve_area("light.kitchen") == "Kitchen"
+    assert lookups == ["light.kitchen"]
+
+    areas["kitchen"] = SimpleNamespace(id="kitchen", name="Galley")
+    listeners["area_registry_updated"](SimpleNamespace(data={"action": "update"}))
+    assert controller._resolve_area("light.kitchen") == "Galley"
+
+    listeners["entity_registry_updated"](
+        SimpleNamespace(data={"action": "update", "entity_id": "light.kitchen"})
+    )
+    controller._resolve_area("light.kitchen")
+    assert lookups == ["light.kitchen"] * 3
+
+    await controller.async_shutdown()
+    assert not listeners
+
+
+async def test_controller_skips_updates_without_changes() -> None:
+    """Updates that repeat the previous state and attributes are not forwarded."""
+
+    hass = _DummyHass()
+    config = replace(_BASE_CONFIG, exposure=("sensor.power",))
+
+    class _RecorderClient:
+        def __init__(self) -> None:
+            self.calls: list[dict[str, Any]] = []
+
+        async def async_post_json(
+            self, payload: dict[str, Any], *, throttled: bool = False
+        ) -> None:
+            self.calls.append(payload)
+
+    client = _RecorderClient()
+    controller = ExposureController(hass, client, config, entry_id="entry-same")
+    await controller.async_setup()
+
+    for old, new in (("5", "5"), ("5", "6")):
+        controller._handle_state_change(
+            _FakeEvent(
+                entity_id="sensor.power",
+                old_state=State("sensor.power", old, {"unit_of_measurement": "W"}),
+                new_state=State("sensor.power", new, {"unit_of_measurement": "W"}),
+                context=None,
+            )
+        )
+    await hass.async_drain()
+
+    assert [call["data"]["state"]["new"]["state"] for call in client.calls] == ["6"]
+
+
+async def test_payload_static_fields_follow_friendly_name() -> None:
+    """Per-entity payload fields are reused until the friendly name changes."""
+
+    hass = _DummyHass()
+    config = _KITCHEN_CONFIG
+    controller = ExposureController(hass, object(), config, entry_id="entry-static")
+
+    def _payload(name: str, state: str) -> dict[str, Any]:
+        new_state = State("light.kitchen", state, {"friendly_name": name})
+        return controller._build_payload("light.kitchen", None, new_state, None)["data"]
+
+    first = _payload("Kitchen", "on")
+    cached = controller._static_fields["light.kitchen"]
+    second = _payload("Kitchen", "off")
+    assert controller._static_fields["light.kitchen"] is cached
+    assert second["state"]["new"]["state"] == "off"
+    assert "state" not in cached and first is not second
+
+    renamed = _payload("Galley", "on")
+    assert renamed["friendly_name"] == "Galley"
+    assert renamed["domain"] == "light"
+    assert renamed["entry_id"] == "entry-static"
+
+
+async def test_controller_drops_updates_while_saturated(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Updates beyond the in-flight ceiling are dropped instead of queued."""
+
+    hass = _DummyHass()
+    config = _LIGHTS_CONFIG
+    monkeypatch.setattr("custom_components.aiembodied.exposure.EXPOSURE_MAX_IN_FLIGHT", 2)
+    release = asyncio.Event()
+
+    class _SlowClient:
+        def __init__(self) -> None:
+            self.calls: list[dict[str, Any]] = []
+
+        async def async_post_json(
+            self, payload: dict[str, Any], *, throttled: bool = False
+        ) -> None:
+            self.calls.append(payload)
+            await release.wait()
+
+    client = _SlowClient()
+    controller = ExposureController(hass, client, config, entry_id="entry-busy")
+    await controller.async_setup()
+
+    def _fire(state: str) -> None:
+        controller._handle_state_change(
+            _FakeEvent(
+                entity_id="light.desk",
+                old_state=State("light.desk", "unknown", {}),
+                new_state=State("light.desk", state, {}),
+                context=None,
+            )
+        )
+
+    for state in ("1", "2", "3"):
+        _fire(state)
+    release.set()
+    await hass.async_drain()
+
+    assert [call["data"]["state"]["new"]["state"] for call in client.calls] == ["1", "2"]
+    assert controller._dropped == 1
+
+    _fire("4")
+    await hass.async_drain()
+    assert len(client.calls) == 3
+
+
+async def test_controller_reports_when_drop_total_crosses_each_hundred(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Drop reports fire on the first drop and once per hundred, whatever the batch size."""
+
+    hass = _DummyHass()
+    controller = ExposureController(hass, object(), _LIGHTS_CONFIG, entry_id="entry-drop")
+    controller._in_flight = EXPOSURE_MAX_IN_FLIGHT
+
+    with caplog.at_level(logging.WARNING, logger="custom_components.aiembodied.exposure"):
+        for size in (1, 60, 60, 5, 90):
+            controller._start_forward({}, [{}] * size)
+
+    assert controller._dropped == 216
+    assert [record.args for record in caplog.records] == [(1,), (121,), (216,)]
+    assert hass.bus.events == [
+        ("aiembodied.updates_dropped", {"entry_id": "entry-drop", "dropped": dropped})
+        for dropped in (1, 121, 216)
+    ]
+
+
+def test_exposure_filters_classify_entries() -> None:
+    """Exposure entries split into explicit entities and whole domains."""
+
+    filters = _ExposureFilters.from_iterable(
+        [" Light.Kitchen ", "sensor.*", "switch", "", "media_player.tv"]
+    )
+
+    assert filters.entities == {"light.kitchen", "media_player.tv"}
+    assert filters.domains == {"sensor", "switch"}
+
+
+async def test_controller_defers_subscription_when_paused_at_startup(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """No listener is attached until a paused entry is resumed."""
+
+    hass = _DummyHass()
+    config = _KITCHEN_CONFIG
+    subscriptions: list[object] = []
+    monkeypatch.setattr(
+        "custom_components.aiembodied.exposure.async_track_state_change_event",
+        lambda hass_obj, entity_ids, action: subscriptions.append(entity_ids) or (lambda: None),
+    )
+
+    controller = ExposureController(
+        hass, object(), config, entry_id="entry-paused", autonomy=_RecorderAutonomy(paused=True)
+    )
+    await controller.async_setup()
+    await controller.async_set_paused(True)
+    assert subscriptions == []
+
+    await controller.async_set_paused(False)
+    assert subscriptions == [["light.kitchen"]]
@@ -2,27 +2,39 @@
 
 from __future__ import annotations
 
+import asyncio
+import dataclasses
+import functools
 from collections.abc import Awaitable, Callable, Iterable
-from typing import Any, Mapping
+from types import SimpleNamespace
+from typing import Any, Mapping, NamedTuple
 
 import pytest
 
 import custom_components.aiembodied as integration
 from custom_components.aiembodied.const import (
-    DATA_RUNTIME,
     DOMAIN,
     OPTIONS_AUTONOMY_PAUSED,
 )
+from homeassistant.components import conversation as ha_conversation
 from homeassistant.exceptions import HomeAssistantError
 
 
+def _null_client(session: object, config: object) -> object:  # noqa: ANN001
+    """Client factory for tests that never reach the upstream service."""
+
+    return object()
+
+
 class _DummyConfigEntries:
     """Minimal config entries manager for testing reload behavior."""
 
+    __slots__ = ("_hass", "forwarded", "unloaded", "updated")
+
     def __init__(self, hass: "_DummyHass") -> None:
         self._hass = hass
-        self.forwarded: list[tuple[object, list[object]]] = []
-        self.unloaded: list[tuple[object, list[object]]] = []
+        self.forwarded: list[tuple[object, Iterable[object]]] = []
+        self.unloaded: list[tuple[object, Iterable[object]]] = []
         self.updated: list[dict[str, Any]] = []
 
     async def async_reload(self, entry_id: str) -> None:
@@ -31,12 +43,12 @@ class _DummyConfigEntries:
     async def async_forward_entry_setups(
         self, entry: object, platforms: Iterable[object]
     ) -> None:  # noqa: ANN001 - signature mirrors Home Assistant
-        self.forwarded.append((entry, list(platforms)))
+        self.forwarded.append((entry, platforms))
 
     async def async_unload_platforms(
         self, entry: object, platforms: Iterable[object]
     ) -> bool:  # noqa: ANN001 - signature mirrors Home Assistant
-        self.unloaded.append((entry, list(platforms)))
+        self.unloaded.append((entry, platforms))
         return True
 
     async def async_update_entry(
@@ -49,8 +61,8 @@ class _DummyConfigEntries:
         if data is not None:  # pragma: no cover - not exercised in these tests
             entry.data = dict(data)
         if options is not None:
-            entry.options = dict(options)
-            self.updated.append(dict(options))
+            entry.options = options if type(options) is dict else dict(options)
+            self.updated.append(entry.options)
         listener = entry._update_listener
         if listener is not None:
             await listener(self._hass, entry)
@@ -59,12 +71,24 @@ class _DummyConfigEntries:
 class _DummyHass:
     """Simplified Home Assistant core object for unit tests."""
 
+    __slots__ = ("data", "config_entries", "reload_requests", "services", "bus", "tasks")
+
     def __init__(self) -> None:
         self.data: dict[str, dict[str, object]] = {}
         self.config_entries = _DummyConfigEntries(self)
         self.reload_requests: list[str] = []
         self.services = _DummyServices()
         self.bus = _DummyBus()
+        self.tasks: list[asyncio.Future[Any]] = []
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return asyncio.get_running_loop()
+
+    def async_create_task(self, coro: Awaitable[Any]) -> asyncio.Future[Any]:
+        task = asyncio.ensure_future(coro)
+        self.tasks.append(task)
+        return task
 
     async def _async_reload(self, entry_id: str) -> None:
         self.reload_requests.append(entry_id)
@@ -73,6 +97,8 @@ class _DummyHass:
 class _DummyBus:
     """Minimal event bus capturing fired events."""
 
+    __slots__ = ("events",)
+
     def __init__(self) -> None:
         self.events: list[tuple[str, dict[str, Any]]] = []
 
@@ -80,12 +106,34 @@ class _DummyBus:
         self.events.append((event_type, event_data))
 
 
+class _ServiceMeta(NamedTuple):
+    """Registration details captured by the services stub."""
+
+    handler: Any
+    schema: object | None
+    supports_response: bool
+
+
+class _ServiceCall(NamedTuple):
+    """Service call captured by the services stub."""
+
+    domain: str
+    service: str
+    service_data: dict[str, Any]
+    blocking: bool
+    return_response: bool
+    target: dict[str, Any] | None
+    context: object | None
+
+
 class _DummyServices:
     """Service registry stub capturing registrations."""
 
+    __slots__ = ("registered", "calls", "async_call_handler")
+
     def __init__(self) -> None:
-        self.registered: dict[tuple[str, str], dict[str, object]] = {}
-        self.calls: list[dict[str, Any]] = []
+        self.registered: dict[tuple[str, str], _ServiceMeta] = {}
+        self.calls: list[_ServiceCall] = []
         self.async_call_handler: Callable[..., Any] | None = None
 
     def has_service(self, domain: str, service: str) -> bool:
@@ -100,11 +148,7 @@ class _DummyServices:
         schema: object | None = None,
         supports_response: bool = False,
     ) -> None:
-        self.registered[(domain, service)] = {
-            "handler": handler,
-            "schema": schema,
-            "supports_response": supports_response,
-        }
+        self.registered[(domain, service)] = _ServiceMeta(handler, schema, supports_response)
 
     async def async_call(
         self,
@@ -117,16 +161,11 @@ class _DummyServices:
         target: dict[str, Any] | None = None,
         context: object | None = None,
     ) -> Any:
-        call = {
-            "domain": domain,
-            "service": service,
-            "service_data": service_data or {},
-            "blocking": blocking,
-            "return_response": return_response,
-            "target": target,
-            "context": context,
-        }
-        self.calls.append(call)
+        self.calls.append(
+            _ServiceCall(
+                domain, service, service_data or {}, blocking, return_response, target, context
+            )
+        )
         if self.async_call_handler is None:
             return {}
         result = self.async_call_handler(
@@ -138,8 +177,8 @@ class _DummyServices:
             return_response=return_response,
             context=context,
         )
-        if hasattr(result, "__await__"):
-            return await result  # type: ignore[return-value]
+        if asyncio.iscoroutine(result) or asyncio.isfuture(result):
+            return await result
         return result
 
 
@@ -156,9 +195,51 @@ class _BaseExposure:
         return None
 
 
+@pytest.fixture(autouse=True)
+def _stub_exposure_controller(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Keep setup tests off the state machine unless a test installs its own controller."""
+
+    monkeypatch.setattr(integration, "ExposureController", lambda *args, **kwargs: _BaseExposure())
+
+
+class _RecordingExposure(_BaseExposure):
+    """Exposure stub counting the lifecycle calls made by the integration."""
+
+    def __init__(self) -> None:
+        self.setup_calls = 0
+        self.shutdown_calls = 0
+        self.pause_calls: list[bool] = []
+
+    async def async_setup(self) -> None:
+        self.setup_calls += 1
+
+    async def async_shutdown(self) -> None:
+        self.shutdown_calls += 1
+
+    async def async_set_paused(self, paused: bool) -> None:
+        self.pause_calls.append(paused)
+
+
+@pytest.fixture
+def recording_exposures(monkeypatch: pytest.MonkeyPatch) -> list[_RecordingExposure]:
+    """Install recording exposure controllers and return the instances created."""
+
+    created: list[_RecordingExposure] = []
+
+    def _factory(*args: object, **kwargs: object) -> _RecordingExposure:  # noqa: ANN001
+        exposure = _RecordingExposure()
+        created.append(exposure)
+        return exposure
+
+    monkeypatch.setattr(integration, "ExposureController", _factory)
+    return created
+
+
 class _MockConfigEntry:
     """Small stub mimicking the ConfigEntry interface used by the integration."""
 
+    __slots__ = ("entry_id", "data", "options", "_update_listener", "_unload_callbacks")
+
     def __init__(self, entry_id: str, data: dict[str, object]) -> None:
         self.entry_id = entry_id
         self.data = data
@@ -180,7 +261,23 @@ class _MockConfigEntry:
         self._unload_callbacks.append(callback)
 
 
-@pytest.mark.asyncio
+async def _async_setup_loaded_entry(
+    entry_id: str,
+    *,
+    client_factory: Callable[[object, object], object] = _null_client,
+    options: Mapping[str, Any] | None = None,
+) -> tuple[_DummyHass, _MockConfigEntry]:
+    """Set up the integration and one loaded entry on a fresh stub hass."""
+
+    hass = _DummyHass()
+    entry = _MockConfigEntry(entry_id, {"endpoint": "https://example.invalid/api"})
+    if options:
+        entry.options.update(options)
+    await integration.async_setup(hass, {})
+    await integration.async_setup_entry(hass, entry, client_factory=client_factory)
+    return hass, entry
+
+
 async def test_async_get_options_flow_returns_handler() -> None:
     """The options flow factory returns a configured handler instance."""
 
@@ -208,8 +305,9 @@ def test_async_get_clientsession_delegates(monkeypatch: pytest.MonkeyPatch) -> N
     assert integration._async_get_clientsession("hass") is sentinel
 
 
-@pytest.mark.asyncio
-async def test_async_setup_entry_stores_runtime(monkeypatch: pytest.MonkeyPatch) -> None:
+async def test_async_setup_entry_stores_runtime(
+    monkeypatch: pytest.MonkeyPatch, recording_exposures: list[_RecordingExposure]
+) -> None:
     """Setting up an entry creates runtime data and registers reload listener."""
 
     hass = _DummyHass()
@@ -227,40 +325,15 @@ async def test_async_setup_entry_stores_runtime(monkeypatch: pytest.MonkeyPatch)
     class _DummyClient:
         pass
 
-    controllers: list[_DummyExposure] = []
-
-    class _DummyExposure:
-        def __init__(
-            self,
-            hass_obj: object,
-            client_obj: object,
-            config_obj: object,
-            entry_id: str,
-            autonomy: object,
-        ) -> None:  # noqa: ANN001
-            self.hass = hass_obj
-            self.client = client_obj
-            self.config = config_obj
-            self.entry_id = entry_id
-            self.setup_calls = 0
-            self.shutdown_calls = 0
-            self.pause_calls: list[bool] = []
-            controllers.append(self)
-
-        async def async_setup(self) -> None:
-            self.setup_calls += 1
-
-        async def async_shutdown(self) -> None:
-            self.shutdown_calls += 1
-
-        async def async_set_paused(self, paused: bool) -> None:
-            self.pause_calls.append(paused)
+    session = object()
 
     def _fake_session_factory(hass_obj: object) -> object:  # noqa: ANN001 - signature for monkeypatch
-        return object()
+        return session
 
     def _fake_client_factory(session: object, config: object) -> _DummyClient:  # noqa: ANN001
         client = _DummyClient()
+        client.session = session  # type: ignore[attr-defined]
+        client.config = config  # type: ignore[attr-defined]
         created_clients.append(client)
         return client
 
@@ -269,79 +342,74 @@ async def test_async_setup_entry_stores_runtime(monkeypatch: pytest.MonkeyPatch)
         return _fake_client_factory(*args, **kwargs)
 
     monkeypatch.setattr(integration, "AIEmbodiedClient", _fake_client_constructor)
-    monkeypatch.setattr(integration, "ExposureController", _DummyExposure)
 
     assert await integration.async_setup(hass, {})
     assert await integration.async_setup_entry(hass, entry)
 
-    runtime_wrapper = hass.data[DOMAIN][entry.entry_id]
-    runtime = runtime_wrapper[DATA_RUNTIME]
+    runtime = hass.data[DOMAIN][entry.entry_id]
     assert runtime.config.endpoint == "https://example.invalid/api"
     assert runtime.config.auth_token == "secret"
     assert runtime.config.headers == {"X-Test": "1"}
     assert isinstance(runtime.client, _DummyClient)
+    assert runtime.client.session is session
+    assert runtime.client.config.headers == {"X-Test": "1"}
+    assert runtime.client.config.auth_token == "secret"
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        runtime.config.endpoint = "https://other.invalid/api"  # type: ignore[misc]
     assert created_clients, "Expected client factory to be invoked"
-    assert controllers and controllers[0].setup_calls == 1
-    assert controllers[0].pause_calls == [False]
+    assert recording_exposures and recording_exposures[0].setup_calls == 1
+    assert recording_exposures[0].pause_calls == [False]
     assert hass.config_entries.forwarded
     forwarded_entry, platforms = hass.config_entries.forwarded[0]
     assert forwarded_entry is entry
-    assert list(platforms) == list(integration.PLATFORMS)
+    assert platforms == integration.PLATFORMS
 
 
-@pytest.mark.asyncio
-async def test_async_unload_entry_cleans_runtime(monkeypatch: pytest.MonkeyPatch) -> None:
-    """Unloading an entry removes runtime state."""
+async def test_async_setup_entry_failure_leaves_nothing_registered(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A failing exposure setup aborts before the entry, agent, or platforms exist."""
 
-    hass = _DummyHass()
-    entry = _MockConfigEntry("entry-2", {"endpoint": "https://example.invalid/api"})
+    class _FailingExposure(_RecordingExposure):
+        async def async_setup(self) -> None:
+            raise RuntimeError("listener wiring failed")
 
-    class _DummyExposure:
-        def __init__(self, *args: object, **kwargs: object) -> None:  # noqa: ANN001
-            self.shutdown_calls = 0
+    monkeypatch.setattr(integration, "ExposureController", lambda *args: _FailingExposure())
 
-        async def async_setup(self) -> None:  # pragma: no cover - not exercised here
-            pass
+    hass = _DummyHass()
+    entry = _MockConfigEntry("entry-setup-fails", {"endpoint": "https://example.invalid/api"})
+    await integration.async_setup(hass, {})
 
-        async def async_shutdown(self) -> None:
-            self.shutdown_calls += 1
+    with pytest.raises(RuntimeError, match="listener wiring failed"):
+        await integration.async_setup_entry(hass, entry, client_factory=_null_client)
 
-        async def async_set_paused(self, paused: bool) -> None:  # noqa: ARG002 - parity with controller
-            return None
+    assert entry.entry_id not in hass.data[DOMAIN]
+    assert ha_conversation.async_get_agent(hass, entry.entry_id) is None
+    assert hass.config_entries.forwarded == []
 
-    exposure_instances: list[_DummyExposure] = []
 
-    def _exposure_factory(*args: object, **kwargs: object) -> _DummyExposure:  # noqa: ANN001
-        exposure = _DummyExposure()
-        exposure_instances.append(exposure)
-        return exposure
+async def test_async_unload_entry_cleans_runtime(
+    recording_exposures: list[_RecordingExposure],
+) -> None:
+    """Unloading an entry removes runtime state."""
 
-    monkeypatch.setattr(integration, "_async_get_clientsession", lambda hass_obj: object())
-    monkeypatch.setattr(integration, "AIEmbodiedClient", lambda *args, **kwargs: object())
-    monkeypatch.setattr(integration, "ExposureController", _exposure_factory)
+    hass = _DummyHass()
+    entry = _MockConfigEntry("entry-2", {"endpoint": "https://example.invalid/api"})
 
     await integration.async_setup(hass, {})
-    await integration.async_setup_entry(hass, entry)
+    await integration.async_setup_entry(hass, entry, client_factory=_null_client)
 
     assert entry.entry_id in hass.data[DOMAIN]
 
     assert await integration.async_unload_entry(hass, entry)
     assert entry.entry_id not in hass.data.get(DOMAIN, {})
-    assert exposure_instances and exposure_instances[0].shutdown_calls == 1
+    assert recording_exposures and recording_exposures[0].shutdown_calls == 1
 
 
-@pytest.mark.asyncio
-async def test_update_listener_triggers_reload(monkeypatch: pytest.MonkeyPatch) -> None:
+async def test_update_listener_triggers_reload() -> None:
     """The update listener requests a reload when invoked."""
 
-    hass = _DummyHass()
-    entry = _MockConfigEntry("entry-3", {"endpoint": "https://example.invalid/api"})
-
-    monkeypatch.setattr(integration, "_async_get_clientsession", lambda hass_obj: object())
-    monkeypatch.setattr(integration, "AIEmbodiedClient", lambda *args, **kwargs: object())
-
-    await integration.async_setup(hass, {})
-    await integration.async_setup_entry(hass, entry)
+    hass, entry = await _async_setup_loaded_entry("entry-3")
 
     assert entry._update_listener is not None
 
@@ -349,41 +417,31 @@ async def test_update_listener_triggers_reload(monkeypatch: pytest.MonkeyPatch)
     assert hass.reload_requests == [entry.entry_id]
 
 
-@pytest.mark.asyncio
-async def test_services_registered_once(monkeypatch: pytest.MonkeyPatch) -> None:
-    """Both helper services are registered with response support."""
+async def test_services_registered_once() -> None:
+    """Both helper services are registered from async_setup with response support."""
 
     hass = _DummyHass()
-    monkeypatch.setattr(integration, "_async_get_clientsession", lambda hass_obj: object())
-    monkeypatch.setattr(integration, "AIEmbodiedClient", lambda *args, **kwargs: object())
-
-    class _StubExposure(_BaseExposure):
-        pass
-
-    monkeypatch.setattr(
-        integration,
-        "ExposureController",
-        lambda *args, **kwargs: _StubExposure(),
-    )
 
     await integration.async_setup(hass, {})
+    services = hass.services.registered
+    registered = dict(services)
+
     entry = _MockConfigEntry("entry-services", {"endpoint": "https://example.invalid/api"})
-    await integration.async_setup_entry(hass, entry)
+    await integration.async_setup_entry(hass, entry, client_factory=_null_client)
+    await integration.async_setup(hass, {})
+    assert services == registered
 
-    services = hass.services.registered
     send_meta = services[(DOMAIN, integration.SERVICE_SEND_CONVERSATION_TURN)]
     invoke_meta = services[(DOMAIN, integration.SERVICE_INVOKE_SERVICE)]
-    assert send_meta["supports_response"] is True
-    assert invoke_meta["supports_response"] is True
+    assert send_meta.supports_response is True
+    assert send_meta.schema is integration.SERVICE_SEND_CONVERSATION_TURN_SCHEMA
+    assert invoke_meta.supports_response is True
+    assert invoke_meta.schema is integration.SERVICE_INVOKE_SERVICE_SCHEMA
 
 
-@pytest.mark.asyncio
-async def test_invoke_service_executes_and_reports(monkeypatch: pytest.MonkeyPatch) -> None:
+async def test_invoke_service_executes_and_reports() -> None:
     """The invoke service helper executes HA services and reports results."""
 
-    hass = _DummyHass()
-    entry = _MockConfigEntry("entry-action", {"endpoint": "https://example.invalid/api"})
-
     clients: list[_RecorderClient] = []
 
     class _RecorderClient:
@@ -394,17 +452,9 @@ async def test_invoke_service_executes_and_reports(monkeypatch: pytest.MonkeyPat
         async def async_post_json(self, payload: dict[str, Any]) -> None:
             self.calls.append(payload)
 
-    class _StubExposure(_BaseExposure):
-        pass
-
-    monkeypatch.setattr(integration, "_async_get_clientsession", lambda hass_obj: object())
-    monkeypatch.setattr(integration, "AIEmbodiedClient", _RecorderClient)
-    monkeypatch.setattr(integration, "ExposureController", lambda *args, **kwargs: _StubExposure())
+    hass, entry = await _async_setup_loaded_entry("entry-action", client_factory=_RecorderClient)
 
-    await integration.async_setup(hass, {})
-    await integration.async_setup_entry(hass, entry)
-
-    handler = hass.services.registered[(DOMAIN, integration.SERVICE_INVOKE_SERVICE)]["handler"]
+    handler = hass.services.registered[(DOMAIN, integration.SERVICE_INVOKE_SERVICE)].handler
 
     def _call_handler(
         domain: str,
@@ -439,7 +489,7 @@ async def test_invoke_service_executes_and_reports(monkeypatch: pytest.MonkeyPat
         "context_parent_id": "parent-1",
     }
 
-    response = await handler(type("_Call", (), {"data": call_data})())
+    response = await handler(SimpleNamespace(data=call_data))
 
     assert response == {
         "success": True,
@@ -447,7 +497,7 @@ async def test_invoke_service_executes_and_reports(monkeypatch: pytest.MonkeyPat
         "correlation_id": "corr-1",
     }
 
-    assert hass.services.calls[0]["domain"] == "light"
+    assert hass.services.calls[0].domain == "light"
     assert hass.bus.events[0][0] == f"{DOMAIN}.action_executed"
     event_payload = hass.bus.events[0][1]
     assert event_payload["success"] is True
@@ -459,96 +509,41 @@ async def test_invoke_service_executes_and_reports(monkeypatch: pytest.MonkeyPat
     assert upstream_payload["action"]["context"]["id"] == "ctx-1"
 
 
-@pytest.mark.asyncio
-async def test_invoke_service_blocked_when_paused(monkeypatch: pytest.MonkeyPatch) -> None:
-    """Service invocations are rejected when autonomy is paused."""
-
-    hass = _DummyHass()
-    entry = _MockConfigEntry("entry-paused", {"endpoint": "https://example.invalid/api"})
-    entry.options[OPTIONS_AUTONOMY_PAUSED] = True
-
-    class _StubExposure:
-        async def async_setup(self) -> None:
-            return None
-
-        async def async_shutdown(self) -> None:  # pragma: no cover - not invoked here
-            return None
-
-        async def async_set_paused(self, paused: bool) -> None:  # noqa: ARG002
-            return None
-
-    monkeypatch.setattr(integration, "_async_get_clientsession", lambda hass_obj: object())
-    monkeypatch.setattr(integration, "AIEmbodiedClient", lambda *args, **kwargs: object())
-    monkeypatch.setattr(integration, "ExposureController", lambda *args, **kwargs: _StubExposure())
-
-    await integration.async_setup(hass, {})
-    await integration.async_setup_entry(hass, entry)
-
-    handler = hass.services.registered[(DOMAIN, integration.SERVICE_INVOKE_SERVICE)]["handler"]
-
-    paused_call = type(
-        "_Call",
-        (),
-        {"data": {"entry_id": entry.entry_id, "domain": "light", "service": "turn_on"}},
-    )()
-
-    with pytest.raises(HomeAssistantError, match="Autonomy is currently paused"):
-        await handler(paused_call)
-
-
-@pytest.mark.asyncio
-async def test_autonomy_state_updates_options(monkeypatch: pytest.MonkeyPatch) -> None:
+async def test_autonomy_state_updates_options(
+    monkeypatch: pytest.MonkeyPatch, recording_exposures: list[_RecordingExposure]
+) -> None:
     """Toggling autonomy updates config entry options and triggers reload."""
 
     hass = _DummyHass()
     entry = _MockConfigEntry("entry-autonomy", {"endpoint": "https://example.invalid/api"})
 
-    class _StubExposure:
-        def __init__(self, *args: object, **kwargs: object) -> None:  # noqa: ANN001
-            self.pause_states: list[bool] = []
-
-        async def async_setup(self) -> None:
-            return None
-
-        async def async_shutdown(self) -> None:  # pragma: no cover - not invoked here
-            return None
-
-        async def async_set_paused(self, paused: bool) -> None:
-            self.pause_states.append(paused)
-
-    exposure_instances: list[_StubExposure] = []
-
-    def _exposure_factory(*args: object, **kwargs: object) -> _StubExposure:  # noqa: ANN001
-        instance = _StubExposure(*args, **kwargs)
-        exposure_instances.append(instance)
-        return instance
-
-    monkeypatch.setattr(integration, "_async_get_clientsession", lambda hass_obj: object())
-    monkeypatch.setattr(integration, "AIEmbodiedClient", lambda *args, **kwargs: object())
-    monkeypatch.setattr(integration, "ExposureController", _exposure_factory)
+    monkeypatch.setattr(
+        integration,
+        "AutonomyController",
+        functools.partial(integration.AutonomyController, persist_delay=0),
+    )
 
     await integration.async_setup(hass, {})
-    await integration.async_setup_entry(hass, entry)
+    await integration.async_setup_entry(hass, entry, client_factory=_null_client)
 
-    runtime = hass.data[DOMAIN][entry.entry_id][DATA_RUNTIME]
+    runtime = hass.data[DOMAIN][entry.entry_id]
     assert runtime.autonomy.paused is False
 
     await runtime.autonomy.async_set_paused(True)
+    for _ in range(5):
+        await asyncio.sleep(0)
+    await asyncio.gather(*hass.tasks)
 
     assert runtime.autonomy.paused is True
     assert entry.options[OPTIONS_AUTONOMY_PAUSED] is True
     assert hass.reload_requests == [entry.entry_id]
     assert hass.config_entries.updated[-1][OPTIONS_AUTONOMY_PAUSED] is True
-    assert exposure_instances and exposure_instances[0].pause_states[-1] is True
+    assert recording_exposures and recording_exposures[0].pause_calls[-1] is True
 
 
-@pytest.mark.asyncio
-async def test_invoke_service_reports_failures(monkeypatch: pytest.MonkeyPatch) -> None:
+async def test_invoke_service_reports_failures() -> None:
     """Service call failures are captured and forwarded."""
 
-    hass = _DummyHass()
-    entry = _MockConfigEntry("entry-action-fail", {"endpoint": "https://example.invalid/api"})
-
     class _RecorderClient:
         def __init__(self, *args: object, **kwargs: object) -> None:  # noqa: ANN001
             self.calls: list[dict[str, Any]] = []
@@ -556,15 +551,14 @@ async def test_invoke_service_reports_failures(monkeypatch: pytest.MonkeyPatch)
         async def async_post_json(self, payload: dict[str, Any]) -> None:
             self.calls.append(payload)
 
-    monkeypatch.setattr(integration, "_async_get_clientsession", lambda hass_obj: object())
     client = _RecorderClient(None, None)
-    monkeypatch.setattr(integration, "AIEmbodiedClient", lambda *args, **kwargs: client)
-    monkeypatch.setattr(integration, "ExposureController", lambda *args, **kwargs: _BaseExposure())
 
-    await integration.async_setup(hass, {})
-    await integration.async_setup_entry(hass, entry)
+    hass, entry = await _async_setup_loaded_entry(
+        "entry-action-fail",
+        client_factory=lambda session, config: client,
+    )
 
-    handler = hass.services.registered[(DOMAIN, integration.SERVICE_INVOKE_SERVICE)]["handler"]
+    handler = hass.services.registered[(DOMAIN, integration.SERVICE_INVOKE_SERVICE)].handler
 
     def _call_handler(*args: object, **kwargs: object) -> None:  # noqa: ANN001
         raise HomeAssistantError("boom")
@@ -577,7 +571,7 @@ async def test_invoke_service_reports_failures(monkeypatch: pytest.MonkeyPatch)
         "service": "turn_on",
     }
 
-    response = await handler(type("_Call", (), {"data": call_data})())
+    response = await handler(SimpleNamespace(data=call_data))
     assert response["success"] is False
     assert "boom" in response["error"]
 
@@ -589,52 +583,46 @@ async def test_invoke_service_reports_failures(monkeypatch: pytest.MonkeyPatch)
     assert client.calls[0]["action"]["success"] is False
 
 
-@pytest.mark.asyncio
-async def test_invoke_service_validates_payload(monkeypatch: pytest.MonkeyPatch) -> None:
-    """Invalid payload data raises errors before execution."""
-
-    hass = _DummyHass()
-    entry = _MockConfigEntry("entry-action-validate", {"endpoint": "https://example.invalid/api"})
-
-    monkeypatch.setattr(integration, "_async_get_clientsession", lambda hass_obj: object())
-    monkeypatch.setattr(integration, "AIEmbodiedClient", lambda *args, **kwargs: object())
-
-    class _StubExposure:
-        async def async_setup(self) -> None:
-            return None
-
-        async def async_shutdown(self) -> None:  # pragma: no cover - unload not exercised
-            return None
+@pytest.mark.parametrize(
+    ("options", "call_data", "message"),
+    [
+        pytest.param(
+            {OPTIONS_AUTONOMY_PAUSED: True},
+            {"domain": "light", "service": "turn_on"},
+            "Autonomy is currently paused",
+            id="paused",
+        ),
+        pytest.param(None, {"domain": 123}, None, id="invalid_domain"),
+        pytest.param(
+            None,
+            {"domain": "light", "service": "turn_on", "service_data": 5},
+            None,
+            id="invalid_service_data",
+        ),
+        pytest.param(
+            None,
+            {"domain": "light", "service": "turn_on", "context_user_id": 42},
+            "context_user_id",
+            id="invalid_context_user_id",
+        ),
+        pytest.param(
+            None,
+            {"domain": "light", "service": "turn_on", "unexpected": True},
+            "extra keys not allowed",
+            id="extra_key",
+        ),
+    ],
+)
+async def test_invoke_service_rejects_call(
+    options: dict[str, Any] | None, call_data: dict[str, Any], message: str | None
+) -> None:
+    """Paused entries and invalid payloads are rejected before execution."""
 
-        async def async_set_paused(self, paused: bool) -> None:  # noqa: ARG002
-            return None
+    hass, entry = await _async_setup_loaded_entry("entry-action-reject", options=options)
 
-    monkeypatch.setattr(
-        integration,
-        "ExposureController",
-        lambda *args, **kwargs: _StubExposure(),
-    )
+    handler = hass.services.registered[(DOMAIN, integration.SERVICE_INVOKE_SERVICE)].handler
+    call = SimpleNamespace(data={"entry_id": entry.entry_id, **call_data})
 
-    await integration.async_setup(hass, {})
-    await integration.async_setup_entry(hass, entry)
-
-    handler = hass.services.registered[(DOMAIN, integration.SERVICE_INVOKE_SERVICE)]["handler"]
-
-    with pytest.raises(HomeAssistantError):
-        await handler(type("_Call", (), {"data": {"entry_id": entry.entry_id, "domain": 123}})())
-
-    with pytest.raises(HomeAssistantError):
-        await handler(
-            type(
-                "_Call",
-                (),
-                {
-                    "data": {
-                        "entry_id": entry.entry_id,
-                        "domain": "light",
-                        "service": "turn_on",
-                        "service_data": 5,
-                    }
-                },
-            )(),
-        )
+    with pytest.raises(HomeAssistantError, match=message):
+        await handler(call)
+    assert not hass.services.calls
@@ -2,39 +2,135 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Callable, Mapping
+from dataclasses import dataclass, field
+from typing import Any as _TypingAny
+from typing import Callable, Mapping
 
 
-@dataclass(frozen=True)
+class Invalid(Exception):
+    """Raised when data does not match a schema."""
+
+
+@dataclass(frozen=True, slots=True)
 class _Marker:
     """Represents a required or optional key in a schema."""
 
     key: str
-    default: Any | None = None
+    default: _TypingAny | None = None
     required: bool = False
+    _hash: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_hash", hash((self.key, self.default, self.required)))
 
     def __hash__(self) -> int:
-        return hash((self.key, self.default, self.required))
+        return self._hash
 
 
-def Required(key: str, default: Any | None = None) -> _Marker:
+def Required(key: str, default: _TypingAny | None = None) -> _Marker:
     """Mark a schema key as required."""
 
     return _Marker(key, default, True)
 
 
-def Optional(key: str, default: Any | None = None) -> _Marker:
+def Optional(key: str, default: _TypingAny | None = None) -> _Marker:
     """Mark a schema key as optional."""
 
     return _Marker(key, default, False)
 
 
+@dataclass(frozen=True)
+class _Length:
+    """Represents a length constraint on a value."""
+
+    min: int | None = None
+    max: int | None = None
+
+
+def Length(min: int | None = None, max: int | None = None) -> _Length:  # noqa: A002
+    """Constrain the length of a value."""
+
+    return _Length(min, max)
+
+
+def All(*validators: _TypingAny) -> tuple[_TypingAny, ...]:
+    """Combine several validators that must all pass."""
+
+    return validators
+
+
+@dataclass(frozen=True)
+class _Any:
+    """Represents a set of alternative validators."""
+
+    validators: tuple[_TypingAny, ...]
+
+
+def Any(*validators: _TypingAny) -> _Any:
+    """Accept a value matching any of the validators."""
+
+    return _Any(validators)
+
+
+def _validate(validator: _TypingAny, value: _TypingAny, path: str) -> _TypingAny:
+    """Validate a single value the way voluptuous does for the supported validators."""
+
+    if validator is None:
+        if value is not None:
+            raise Invalid(f"expected None @ data[{path!r}]")
+        return value
+    if isinstance(validator, type):
+        if not isinstance(value, validator):
+            raise Invalid(f"expected {validator.__name__} @ data[{path!r}]")
+        return value
+    if isinstance(validator, tuple):
+        for inner in validator:
+            value = _validate(inner, value, path)
+        return value
+    if isinstance(validator, _Length):
+        size = len(value)
+        if (validator.min is not None and size < validator.min) or (
+            validator.max is not None and size > validator.max
+        ):
+            raise Invalid(f"length of value is out of range @ data[{path!r}]")
+        return value
+    if isinstance(validator, _Any):
+        for inner in validator.validators:
+            try:
+                return _validate(inner, value, path)
+            except Invalid:
+                continue
+        raise Invalid(f"no valid value @ data[{path!r}]")
+    if callable(validator):
+        return validator(value)
+    if value != validator:
+        raise Invalid(f"not a valid value @ data[{path!r}]")
+    return value
+
+
 class Schema(dict):
     """Very small schema implementation for form building."""
 
-    def __init__(self, schema: Mapping[Any, Callable[..., Any] | type]) -> None:
+    def __init__(self, schema: Mapping[_TypingAny, Callable[..., _TypingAny] | type]) -> None:
         super().__init__(schema)
 
-    def __call__(self, data: Mapping[str, Any]) -> Mapping[str, Any]:
-        return data
+    def __call__(self, data: Mapping[str, _TypingAny]) -> dict[str, _TypingAny]:
+        """Validate ``data``, rejecting non-dicts, missing required keys, and extra keys."""
+
+        if not isinstance(data, dict):
+            raise Invalid("expected a dictionary")
+        result: dict[str, _TypingAny] = {}
+        known: set[_TypingAny] = set()
+        for marker, validator in self.items():
+            key = marker.key if isinstance(marker, _Marker) else marker
+            known.add(key)
+            if key in data:
+                result[key] = _validate(validator, data[key], key)
+            elif isinstance(marker, _Marker) and marker.required:
+                raise Invalid(f"required key not provided @ data[{key!r}]")
+            elif isinstance(marker, _Marker) and marker.default is not None:
+                result[key] = marker.default
+        extra = next((key for key in data if key not in known), None)
+        if extra is not None:
+            raise Invalid(f"extra keys not allowed @ data[{extra!r}]")
+        return result